@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Taskwarrior hook that reports changes to the running GUI.
+
+Installed as both ``on-add-taskgui.py`` and ``on-modify-taskgui.py``. Each
+added or modified task is appended as one JSON line to a spool file in the
+data directory, which the app reads instead of exporting. The task is passed
+back to Taskwarrior unchanged, and a failure to spool never blocks it.
+"""
+import json
+import os
+import sys
+
+SPOOL_NAME = "taskgui-spool.jsonl"
+
+
+def spool_path(argv):
+    for arg in argv[1:]:
+        if arg.startswith("data:"):
+            return os.path.join(arg[len("data:"):], SPOOL_NAME)
+    # Hooks live in <data>/hooks unless rc.hooks.location says otherwise.
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(argv[0]))), SPOOL_NAME)
+
+
+def main():
+    # on-add receives the new task; on-modify the original and then the modified one.
+    lines = [line for line in sys.stdin.read().splitlines() if line.strip()]
+    if not lines:
+        return 0
+    task_line = lines[-1]
+    event = "add" if os.path.basename(sys.argv[0]).startswith("on-add") else "modify"
+    try:
+        record = json.dumps({"event": event, "task": json.loads(task_line)}, ensure_ascii=False)
+        fd = os.open(spool_path(sys.argv), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (record + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+    except (OSError, ValueError):
+        pass
+    sys.stdout.write(task_line + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
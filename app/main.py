@@ -1,13 +1,40 @@
 import os
 import sys
+import time
 
-from PyQt6.QtGui import QIcon
-from PyQt6.QtWidgets import QApplication
+# Everything heavier is imported inside main() so startup can be profiled phase by phase.
+PROFILE_FLAG = "--profile-startup"
+PROFILE_ENV = "TASKGUI_PROFILE_STARTUP"
+IMPORT_BUDGET_MS = 400
 
-from app.services.settings_service import SettingsService
-from app.services.task_service import TaskService
-from app.ui.main_window import MainWindow
-from app.ui.styles import APP_STYLESHEET
+
+class StartupProfile:
+    """Per-phase startup timings, printed to stderr when profiling is on."""
+
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases: list[tuple[str, float]] = []
+        self.reported = False
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000))
+        self.last = now
+
+    def report(self) -> None:
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        lines = ["启动耗时："]
+        for phase, elapsed in self.phases:
+            lines.append(f"  {elapsed:8.1f} ms  {phase}")
+        lines.append(f"  {(self.last - self.started) * 1000:8.1f} ms  合计")
+        imports = sum(elapsed for phase, elapsed in self.phases if phase.startswith("导入"))
+        if imports > IMPORT_BUDGET_MS:
+            lines.append(f"  导入耗时 {imports:.1f} ms，超出预算 {IMPORT_BUDGET_MS} ms")
+        print("\n".join(lines), file=sys.stderr)
 
 
 def _ensure_bundled_task_on_path():
@@ -24,15 +51,73 @@ def _ensure_bundled_task_on_path():
 
 
 def main():
+    profiling = PROFILE_FLAG in sys.argv or bool(os.environ.get(PROFILE_ENV))
+    if PROFILE_FLAG in sys.argv:
+        sys.argv.remove(PROFILE_FLAG)
+    profile = StartupProfile(profiling)
+
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtGui import QIcon
+    from PyQt6.QtWidgets import QApplication
+
+    profile.mark("导入 PyQt6")
+    from app.services.settings_service import (
+        READ_BACKEND_KEY,
+        SHELL_COMMAND_KEY,
+        TASK_BACKEND_KEY,
+        SettingsService,
+    )
+    from app.services.task_backend import create_backend
+    from app.services.task_cache import TaskCache
+    from app.services.task_service import TaskService
+    from app.services.task_snapshot import TaskSnapshot
+
+    profile.mark("导入服务层")
+    from app.ui.main_window import MainWindow
+    from app.ui.styles import APP_STYLESHEET
+
+    profile.mark("导入界面")
+
     _ensure_bundled_task_on_path()
     app = QApplication(sys.argv)
     icon_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "icon.png"))
     if os.path.exists(icon_path):
         app.setWindowIcon(QIcon(icon_path))
     app.setStyleSheet(APP_STYLESHEET)
-    window = MainWindow(TaskService(), SettingsService())
+    profile.mark("创建应用")
+    settings_service = SettingsService()
+    backend = create_backend(
+        settings_service.get_preference(TASK_BACKEND_KEY, "local"),
+        settings_service.get_preference(SHELL_COMMAND_KEY),
+    )
+    task_service = TaskService(
+        TaskCache(),
+        settings_service.get_preference(READ_BACKEND_KEY, "cli"),
+        backend,
+    )
+    profile.mark("初始化服务")
+    window = MainWindow(task_service, settings_service, TaskSnapshot())
+    profile.mark("构建主窗口")
     window.show()
-    sys.exit(app.exec())
+    profile.mark("显示窗口")
+    if profiling:
+        pending = ["首次绘制", "首次同步"]
+
+        def finish(phase: str):
+            if phase not in pending:
+                return
+            pending.remove(phase)
+            profile.mark(phase)
+            if not pending:
+                profile.report()
+
+        # Queued after the window's own deferred work (icons), so this covers first paint.
+        QTimer.singleShot(0, lambda: finish("首次绘制"))
+        window.tasks_loaded.connect(lambda: finish("首次同步"))
+        app.aboutToQuit.connect(profile.report)
+    exit_code = app.exec()
+    settings_service.close()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -1,17 +1,326 @@
+import calendar
+import sys
+import time
 from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+PRIORITY_LABELS = {
+    "H": "紧急",
+    "M": "重要",
+    "L": "低优先",
+}
+
+DEFAULT_STATUS_LABEL = "待开始"
+NONE_TYPE_LABEL = "无"
+NONE_STATUS_LABEL = "无状态"
+
+
+# Search query prefix -> TaskItem attribute. Unprefixed terms search every field.
+SEARCH_FIELDS = {
+    "desc": "description",
+    "note": "note",
+    "link": "link",
+    "project": "project",
+    "type": "xtype",
+    "status": "xstatus",
+}
+
+FIELD_ALIASES = {
+    "description": "desc",
+    "xdesc": "note",
+    "xtype": "type",
+    "xstatus": "status",
+}
+
+
+def normalize_task_type(value: str) -> str:
+    if not value:
+        return ""
+    value = value.strip()
+    if value == NONE_TYPE_LABEL:
+        return ""
+    return value
 
 
-@dataclass
 class TaskItem:
-    task_id: int | None
-    uuid: str
-    description: str
-    xtype: str
-    note: str
-    task_state: str
-    xstatus: str
-    link: str
-    priority: str
-    project: str
-    due: str
-    end: str
+    """One Taskwarrior task.
+
+    Instances are slotted and low-cardinality fields are interned, so large
+    exports share one string per distinct type, status, priority and project.
+    ``due``/``end`` are parsed once into epoch seconds (``due_ts``/``end_ts``)
+    and read back as Taskwarrior's compact UTC form. ``due_day`` caches the
+    local calendar day of the due date (a ``date.toordinal()``) for sorting,
+    filtering and rendering; assign ``due`` rather than ``due_ts`` to keep it
+    in sync.
+    """
+
+    __slots__ = (
+        "task_id",
+        "uuid",
+        "description",
+        "xtype",
+        "note",
+        "task_state",
+        "xstatus",
+        "link",
+        "priority",
+        "project",
+        "due_ts",
+        "end_ts",
+        "due_day",
+    )
+
+    def __init__(
+        self,
+        task_id: int | None,
+        uuid: str,
+        description: str,
+        xtype: str,
+        note: str,
+        task_state: str,
+        xstatus: str,
+        link: str,
+        priority: str,
+        project: str,
+        due: str,
+        end: str,
+    ) -> None:
+        self.task_id = task_id
+        self.uuid = uuid
+        self.description = description
+        self.xtype = _intern(xtype)
+        self.note = note
+        self.task_state = _intern(task_state)
+        self.xstatus = _intern(xstatus)
+        self.link = link
+        self.priority = _intern(priority)
+        self.project = _intern(project)
+        self.due = due
+        self.end_ts = parse_timestamp(end)
+
+    @property
+    def due(self) -> str:
+        return format_timestamp(self.due_ts)
+
+    @due.setter
+    def due(self, value: str) -> None:
+        self.due_ts = parse_timestamp(value)
+        self.due_day = local_day(self.due_ts)
+
+    @property
+    def end(self) -> str:
+        return format_timestamp(self.end_ts)
+
+    @end.setter
+    def end(self, value: str) -> None:
+        self.end_ts = parse_timestamp(value)
+
+    @classmethod
+    def from_values(cls, values: tuple) -> "TaskItem":
+        """Rebuild a task from ``to_values()`` without reparsing timestamps."""
+        task = cls.__new__(cls)
+        (
+            task.task_id,
+            task.uuid,
+            task.description,
+            xtype,
+            task.note,
+            task_state,
+            xstatus,
+            task.link,
+            priority,
+            project,
+            task.due_ts,
+            task.end_ts,
+        ) = values
+        task.xtype = _intern(xtype)
+        task.task_state = _intern(task_state)
+        task.xstatus = _intern(xstatus)
+        task.priority = _intern(priority)
+        task.project = _intern(project)
+        # The local day depends on the time zone, so it is not stored.
+        task.due_day = local_day(task.due_ts)
+        return task
+
+    def to_values(self) -> tuple:
+        return (
+            self.task_id,
+            self.uuid,
+            self.description,
+            self.xtype,
+            self.note,
+            self.task_state,
+            self.xstatus,
+            self.link,
+            self.priority,
+            self.project,
+            self.due_ts,
+            self.end_ts,
+        )
+
+    def replace(self, **changes) -> "TaskItem":
+        """Return a copy with ``changes`` applied, like ``dataclasses.replace``."""
+        values = {
+            "task_id": self.task_id,
+            "uuid": self.uuid,
+            "description": self.description,
+            "xtype": self.xtype,
+            "note": self.note,
+            "task_state": self.task_state,
+            "xstatus": self.xstatus,
+            "link": self.link,
+            "priority": self.priority,
+            "project": self.project,
+            "due": self.due,
+            "end": self.end,
+        }
+        values.update(changes)
+        return TaskItem(**values)
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        # due_day is derived from due_ts, so to_values() covers every field.
+        return self is other or self.to_values() == other.to_values()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"TaskItem({fields})"
+
+
+def _intern(value: str | None) -> str:
+    return sys.intern(value) if value else ""
+
+
+TIMESTAMP_PATTERNS = (
+    "%Y%m%dT%H%M%SZ",
+    "%Y%m%dT%H%M%S",
+    "%Y-%m-%d",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%S",
+)
+
+
+def parse_timestamp(value: str | None) -> int | None:
+    """Parse a Taskwarrior date into epoch seconds; naive values are local time.
+
+    Taskwarrior exports ``YYYYMMDDTHHMMSSZ``, which is decoded by slicing in a
+    single pass. Anything else falls back to trying the known patterns.
+    """
+    if not value:
+        return None
+    if len(value) == 16 and value[8] == "T" and value[15] == "Z":
+        try:
+            return calendar.timegm(
+                (
+                    int(value[0:4]),
+                    int(value[4:6]),
+                    int(value[6:8]),
+                    int(value[9:11]),
+                    int(value[11:13]),
+                    int(value[13:15]),
+                )
+            )
+        except ValueError:
+            return None
+    for pattern in TIMESTAMP_PATTERNS:
+        try:
+            parsed = datetime.strptime(value, pattern)
+        except ValueError:
+            continue
+        if pattern.endswith("Z"):
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp())
+    if len(value) >= 8 and value[:8].isdigit():
+        try:
+            return int(datetime.strptime(value[:8], "%Y%m%d").timestamp())
+        except ValueError:
+            return None
+    return None
+
+
+def format_timestamp(value: int | None) -> str:
+    if value is None:
+        return ""
+    return time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(value))
+
+
+def local_day(value: int | None) -> int | None:
+    if value is None:
+        return None
+    local = time.localtime(value)
+    return date(local.tm_year, local.tm_mon, local.tm_mday).toordinal()
+
+
+def day_from_iso(value: str) -> int | None:
+    try:
+        return date.fromisoformat(value).toordinal()
+    except ValueError:
+        return None
+
+
+@dataclass
+class TaskFilter:
+    """The slice of tasks a view shows.
+
+    ``xtype``/``xstatus``/``project`` of ``None`` mean "any"; an empty string
+    means "not set". Due bounds are ``yyyy-MM-dd`` dates. ``search`` uses the
+    search box syntax (see ``parse_query``).
+    """
+
+    state: str = "all"
+    xtype: str | None = None
+    xstatus: str | None = None
+    project: str | None = None
+    due_before: str = ""
+    due_after: str = ""
+    search: str = ""
+
+    def matches(self, task: TaskItem) -> bool:
+        if self.state == "pending" and task.task_state != "pending":
+            return False
+        if self.state == "completed" and task.task_state != "completed":
+            return False
+        if self.xtype is not None and normalize_task_type(task.xtype) != self.xtype:
+            return False
+        if self.xstatus is not None and (task.xstatus or "") != self.xstatus:
+            return False
+        if self.project is not None:
+            project = task.project or ""
+            if self.project == "":
+                if project:
+                    return False
+            elif project != self.project and not project.startswith(f"{self.project}."):
+                return False
+        if self.due_before or self.due_after:
+            if task.due_day is None:
+                return False
+            before = day_from_iso(self.due_before) if self.due_before else None
+            after = day_from_iso(self.due_after) if self.due_after else None
+            if before is not None and task.due_day >= before:
+                return False
+            if after is not None and task.due_day <= after:
+                return False
+        for field, term in parse_query(self.search):
+            attributes = [SEARCH_FIELDS[field]] if field else SEARCH_FIELDS.values()
+            if not any(term in (getattr(task, name) or "").lower() for name in attributes):
+                return False
+        return True
+
+
+def parse_query(query: str) -> list[tuple[str, str]]:
+    terms = []
+    for raw in query.lower().split():
+        field = ""
+        term = raw
+        prefix, sep, rest = raw.partition(":")
+        if sep:
+            prefix = FIELD_ALIASES.get(prefix, prefix)
+            if prefix in SEARCH_FIELDS:
+                field = prefix
+                term = rest
+        if term:
+            terms.append((field, term))
+    return terms
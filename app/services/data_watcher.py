@@ -0,0 +1,83 @@
+import os
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+# Taskwarrior 2.x keeps *.data files; 3.x keeps taskchampion.sqlite3 (+ -wal/-shm).
+SQLITE_PREFIX = "taskchampion.sqlite3"
+DEBOUNCE_MS = 500
+
+
+def is_data_file(name: str) -> bool:
+    return name.endswith(".data") or name.startswith(SQLITE_PREFIX)
+
+
+class TaskDataWatcher(QObject):
+    """Emits ``changed`` when Taskwarrior's data files change on disk.
+
+    A burst of file events (one command touches several files) is collapsed
+    into one signal after ``DEBOUNCE_MS``. The signal is also suppressed when
+    the files look the same as at the last ``mark_seen()``, so syncing never
+    retriggers itself.
+    """
+
+    changed = pyqtSignal()
+
+    def __init__(self, location: str, parent=None):
+        super().__init__(parent)
+        self.location = location
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_event)
+        self.watcher.fileChanged.connect(self._on_event)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(DEBOUNCE_MS)
+        self.timer.timeout.connect(self._on_timeout)
+        self._seen = self.signature()
+        if os.path.isdir(location):
+            self.watcher.addPath(location)
+        self._watch_files()
+
+    def signature(self) -> tuple:
+        entries = []
+        try:
+            names = sorted(os.listdir(self.location))
+        except OSError:
+            return ()
+        for name in names:
+            if not is_data_file(name):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.location, name))
+            except OSError:
+                continue
+            entries.append((name, stat.st_mtime_ns, stat.st_size))
+        return tuple(entries)
+
+    def mark_seen(self) -> None:
+        self._seen = self.signature()
+
+    def _watch_files(self) -> None:
+        # Files replaced by rename drop out of the watcher and must be re-added.
+        watched = set(self.watcher.files())
+        try:
+            names = os.listdir(self.location)
+        except OSError:
+            return
+        paths = [
+            os.path.join(self.location, name)
+            for name in names
+            if is_data_file(name) and os.path.join(self.location, name) not in watched
+        ]
+        if paths:
+            self.watcher.addPaths(paths)
+
+    def _on_event(self, _path: str) -> None:
+        self._watch_files()
+        self.timer.start()
+
+    def _on_timeout(self) -> None:
+        signature = self.signature()
+        if signature == self._seen:
+            return
+        self._seen = signature
+        self.changed.emit()
@@ -0,0 +1,111 @@
+import re
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import List
+
+from app.models import format_timestamp, normalize_task_type
+
+# Inline token name -> import attribute; "：" is accepted as well as ":".
+TOKEN_ATTRIBUTES = {
+    "type": "xtype",
+    "类型": "xtype",
+    "status": "xstatus",
+    "状态": "xstatus",
+    "due": "due",
+    "截止": "due",
+    "priority": "priority",
+    "pri": "priority",
+    "优先级": "priority",
+}
+PRIORITY_MARKERS = {"!!!": "H", "!!": "M", "!": "L"}
+RELATIVE_DAYS = {"today": 0, "今天": 0, "tomorrow": 1, "明天": 1, "后天": 2}
+DEFAULT_PRIORITY = "L"
+
+TOKEN = re.compile(r"^([^\s:：]+)[:：](.+)$")
+# "- ", "* ", "• ", "1. ", "1) ", "1、" and markdown checkboxes left over from
+# pasted lists. "." and ")" need a space after them so "3.5 hours" stays intact.
+LIST_PREFIX = re.compile(r"^\s*(?:[-*•·]\s+|\d+(?:[.)]\s+|、\s*))?(?:\[([ xX])\]\s*)?")
+
+
+def parse_quick_add(text: str) -> List[dict]:
+    """Turn quick-add text, one task per line, into ``task import`` records.
+
+    Each line may carry ``type:``, ``status:``, ``due:`` and ``priority:``
+    tokens (or ``!``/``!!``/``!!!`` for low/medium/high); the remaining words
+    form the description. Lines are stripped of list bullets, and a ``[x]``
+    checkbox imports the task as completed. Lines with no description are
+    skipped. Raises ``ValueError`` naming the line for an unreadable value.
+    """
+    now = int(time.time())
+    records = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        try:
+            record = parse_line(line, now)
+        except ValueError as exc:
+            raise ValueError(f"第 {number} 行：{exc}")
+        if record is not None:
+            records.append(record)
+    return records
+
+
+def parse_line(line: str, now: int) -> dict | None:
+    prefix = LIST_PREFIX.match(line)
+    checked = prefix.group(1) in ("x", "X")
+    record = {"status": "completed" if checked else "pending", "priority": DEFAULT_PRIORITY}
+    words = []
+    for word in line[prefix.end():].split():
+        if word in PRIORITY_MARKERS:
+            record["priority"] = PRIORITY_MARKERS[word]
+            continue
+        match = TOKEN.match(word)
+        attribute = TOKEN_ATTRIBUTES.get(match.group(1).lower()) if match else None
+        if attribute is None:
+            words.append(word)
+            continue
+        value = match.group(2)
+        if attribute == "xtype":
+            value = normalize_task_type(value)
+        elif attribute == "priority":
+            value = value.upper()
+            if value not in PRIORITY_MARKERS.values():
+                raise ValueError(f"无法识别的优先级：{match.group(2)}")
+        elif attribute == "due":
+            value = parse_due(value, now)
+        if value:
+            record[attribute] = value
+    if not words:
+        return None
+    record["description"] = " ".join(words)
+    record["uuid"] = str(uuid.uuid4())
+    record["entry"] = format_timestamp(now)
+    if checked:
+        record["end"] = record["entry"]
+    return record
+
+
+def parse_due(value: str, now: int) -> str:
+    """``2026-10-20``, ``10-20``, ``today``/``tomorrow`` (or 今天/明天/后天), or ``+3d``.
+
+    Due dates are stored at local noon, like the date picker does.
+    """
+    today = date.fromtimestamp(now)
+    lowered = value.lower()
+    if lowered in RELATIVE_DAYS:
+        day = today + timedelta(days=RELATIVE_DAYS[lowered])
+    elif re.fullmatch(r"\+\d+d", lowered):
+        day = today + timedelta(days=int(lowered[1:-1]))
+    else:
+        day = None
+        for pattern in ("%Y-%m-%d", "%Y/%m/%d", "%m-%d", "%m/%d"):
+            try:
+                parsed = datetime.strptime(value, pattern)
+            except ValueError:
+                continue
+            day = parsed.date()
+            if "%Y" not in pattern:
+                day = day.replace(year=today.year)
+            break
+        if day is None:
+            raise ValueError(f"无法识别的截止日期：{value}")
+    return format_timestamp(int(time.mktime(datetime(day.year, day.month, day.day, 12).timetuple())))
@@ -0,0 +1,121 @@
+from typing import Iterable
+
+from app.models import SEARCH_FIELDS, TaskItem, parse_query
+
+
+class SearchIndex:
+    """Character n-gram index over the searchable task fields.
+
+    Every field is indexed by its single characters and bigrams, which works
+    for CJK text without a word segmenter. A query term is resolved by
+    intersecting the postings of its bigrams and then confirming the substring
+    on the few candidates left, so lookups do not scan the task list.
+    """
+
+    def __init__(self) -> None:
+        self._postings: dict[str, dict[str, set[str]]] = {field: {} for field in SEARCH_FIELDS}
+        self._texts: dict[str, dict[str, str]] = {}
+        self._tasks: dict[str, TaskItem] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def update(self, tasks: Iterable[TaskItem]) -> None:
+        """Bring the index in line with ``tasks``, touching only what changed."""
+        incoming = {task.uuid: task for task in tasks if task.uuid}
+        for task_uuid in [task_uuid for task_uuid in self._tasks if task_uuid not in incoming]:
+            self.remove(task_uuid)
+        for task_uuid, task in incoming.items():
+            current = self._tasks.get(task_uuid)
+            if current is task or current == task:
+                continue
+            self.add(task)
+
+    def add(self, task: TaskItem) -> None:
+        if task.uuid in self._tasks:
+            self.remove(task.uuid)
+        texts = {}
+        for field, attribute in SEARCH_FIELDS.items():
+            text = (getattr(task, attribute) or "").lower()
+            if not text:
+                continue
+            texts[field] = text
+            postings = self._postings[field]
+            for gram in _grams(text):
+                bucket = postings.get(gram)
+                if bucket is None:
+                    postings[gram] = {task.uuid}
+                else:
+                    bucket.add(task.uuid)
+        self._texts[task.uuid] = texts
+        self._tasks[task.uuid] = task
+
+    def remove(self, task_uuid: str) -> None:
+        texts = self._texts.pop(task_uuid, None)
+        self._tasks.pop(task_uuid, None)
+        if not texts:
+            return
+        for field, text in texts.items():
+            postings = self._postings[field]
+            for gram in _grams(text):
+                bucket = postings.get(gram)
+                if bucket is None:
+                    continue
+                bucket.discard(task_uuid)
+                if not bucket:
+                    del postings[gram]
+
+    def search(self, query: str) -> set[str] | None:
+        """Return the uuids matching every term of ``query``.
+
+        ``None`` means the query is empty and everything matches. Terms may be
+        prefixed with a field name, e.g. ``note:会议`` or ``type:bug``.
+        """
+        terms = parse_query(query)
+        if not terms:
+            return None
+        result: set[str] | None = None
+        for field, term in sorted(terms, key=lambda item: -len(item[1])):
+            fields = [field] if field else list(SEARCH_FIELDS)
+            matches: set[str] = set()
+            for name in fields:
+                matches |= self._match_field(name, term, result)
+            result = matches
+            if not result:
+                break
+        return result
+
+    def _match_field(self, field: str, term: str, within: set[str] | None) -> set[str]:
+        field_postings = self._postings[field]
+        grams = {term} if len(term) == 1 else {term[i:i + 2] for i in range(len(term) - 1)}
+        postings = [within] if within is not None else []
+        for gram in grams:
+            posting = field_postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = postings[0] & postings[1] if len(postings) > 1 else set(postings[0])
+        for posting in postings[2:]:
+            if not candidates:
+                return candidates
+            candidates &= posting
+        if len(term) <= 2:
+            return candidates
+        return {
+            task_uuid
+            for task_uuid in candidates
+            if term in self._texts[task_uuid].get(field, "")
+        }
+
+
+def build_index(tasks: Iterable[TaskItem]) -> SearchIndex:
+    index = SearchIndex()
+    index.update(tasks)
+    return index
+
+
+def _grams(text: str) -> set[str]:
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
@@ -1,10 +1,19 @@
 import os
 import sqlite3
-from typing import List
+import threading
+from typing import Callable, List
 
 DEFAULT_TASK_TYPES = ["需求", "bug", "其他"]
 DEFAULT_STATUSES = ["待开始", "等待评审", "进行中", "已完成"]
 
+READ_BACKEND_KEY = "read_backend"
+TASK_BACKEND_KEY = "task_backend"
+SHELL_COMMAND_KEY = "shell_command"
+
+# Listener keys for the two lists; preferences use their own key.
+TASK_TYPES_KEY = "task_types"
+STATUSES_KEY = "statuses"
+
 
 def _sanitize_types(types: List[str]) -> List[str]:
     seen = set()
@@ -38,42 +47,116 @@ def _sanitize_statuses(statuses: List[str]) -> List[str]:
     return cleaned
 
 
+def _renamed(names: List[str], old: str, new: str) -> List[str]:
+    # A merge drops ``old`` so ``new`` keeps its place, as in the settings tabs.
+    if new in names:
+        return [name for name in names if name != old]
+    return [new if name == old else name for name in names]
+
+
 class SettingsService:
+    """App settings in ``app_settings.db``.
+
+    One connection (WAL mode) is kept open for the lifetime of the service and
+    shared across threads under a lock. Reads are served from memory after the
+    first query; every write updates the cache and calls the listeners
+    registered with ``add_listener`` as ``callback(key, value)``, on the
+    writing thread. Keys are ``TASK_TYPES_KEY``, ``STATUSES_KEY`` or a
+    preference key.
+    """
+
     def __init__(self, db_path: str | None = None) -> None:
         self.db_path = db_path or os.path.join(os.getcwd(), "app_settings.db")
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("pragma journal_mode=wal")
+        self._lists: dict[str, List[str]] = {}
+        self._preferences: dict[str, str | None] = {}
+        self._listeners: List[Callable[[str, object], None]] = []
         self._ensure_db()
 
+    def add_listener(self, callback: Callable[[str, object], None]) -> None:
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[str, object], None]) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
     def get_task_types(self) -> List[str]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                "select name from task_types order by position asc, name asc"
-            ).fetchall()
-        return [row[0] for row in rows]
+        return list(self._read_names(TASK_TYPES_KEY, "task_types"))
 
     def set_task_types(self, types: List[str]) -> List[str]:
         cleaned = _sanitize_types(types)
-        with self._connect() as conn:
-            self._save_types(conn, cleaned)
+        self._write_names(TASK_TYPES_KEY, "task_types", cleaned)
         return cleaned
 
     def get_statuses(self) -> List[str]:
-        with self._connect() as conn:
-            rows = conn.execute(
-                "select name from statuses order by position asc, name asc"
-            ).fetchall()
-        return [row[0] for row in rows]
+        return list(self._read_names(STATUSES_KEY, "statuses"))
 
     def set_statuses(self, statuses: List[str]) -> List[str]:
         cleaned = _sanitize_statuses(statuses)
-        with self._connect() as conn:
-            self._save_statuses(conn, cleaned)
+        self._write_names(STATUSES_KEY, "statuses", cleaned)
         return cleaned
 
-    def _connect(self):
-        return sqlite3.connect(self.db_path)
+    def rename_task_type(self, old: str, new: str) -> List[str]:
+        """Rename ``old`` in place; if ``new`` is already listed the two are merged."""
+        return self.set_task_types(_renamed(self.get_task_types(), old, new))
+
+    def rename_status(self, old: str, new: str) -> List[str]:
+        return self.set_statuses(_renamed(self.get_statuses(), old, new))
+
+    def get_preference(self, key: str, default: str = "") -> str:
+        with self._lock:
+            if key not in self._preferences:
+                row = self._conn.execute("select value from preferences where key = ?", (key,)).fetchone()
+                self._preferences[key] = row[0] if row else None
+            value = self._preferences[key]
+        return default if value is None else value
+
+    def set_preference(self, key: str, value: str) -> None:
+        self.set_preferences({key: value})
+
+    def set_preferences(self, values: dict[str, str]) -> None:
+        """Store several preferences in one transaction."""
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    """
+                    insert into preferences (key, value) values (?, ?)
+                    on conflict(key) do update set value = excluded.value
+                    """,
+                    list(values.items()),
+                )
+            self._preferences.update(values)
+        for key, value in values.items():
+            self._notify(key, value)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _read_names(self, cache_key: str, table: str) -> List[str]:
+        with self._lock:
+            if cache_key not in self._lists:
+                rows = self._conn.execute(
+                    f"select name from {table} order by position asc, name asc"
+                ).fetchall()
+                self._lists[cache_key] = [row[0] for row in rows]
+            return self._lists[cache_key]
+
+    def _write_names(self, cache_key: str, table: str, names: List[str]) -> None:
+        with self._lock:
+            with self._conn:
+                self._save_names(table, names)
+            self._lists[cache_key] = list(names)
+        self._notify(cache_key, list(names))
+
+    def _notify(self, key: str, value: object) -> None:
+        for callback in list(self._listeners):
+            callback(key, value)
 
     def _ensure_db(self) -> None:
-        with self._connect() as conn:
+        with self._lock, self._conn as conn:
             conn.execute(
                 """
                 create table if not exists task_types (
@@ -90,27 +173,27 @@ class SettingsService:
                 )
                 """
             )
+            conn.execute(
+                """
+                create table if not exists preferences (
+                    key text primary key,
+                    value text not null
+                )
+                """
+            )
             cur = conn.execute("select count(*) from task_types")
             count = cur.fetchone()[0]
             if count == 0:
-                self._save_types(conn, DEFAULT_TASK_TYPES)
+                self._save_names("task_types", DEFAULT_TASK_TYPES)
             cur = conn.execute("select count(*) from statuses")
             count = cur.fetchone()[0]
             if count == 0:
-                self._save_statuses(conn, DEFAULT_STATUSES)
-
-    def _save_types(self, conn, types: List[str]) -> None:
-        conn.execute("delete from task_types")
-        for index, name in enumerate(types):
-            conn.execute(
-                "insert into task_types (name, position) values (?, ?)",
-                (name, index),
-            )
+                self._save_names("statuses", DEFAULT_STATUSES)
 
-    def _save_statuses(self, conn, statuses: List[str]) -> None:
-        conn.execute("delete from statuses")
-        for index, name in enumerate(statuses):
-            conn.execute(
-                "insert into statuses (name, position) values (?, ?)",
-                (name, index),
-            )
+    def _save_names(self, table: str, names: List[str]) -> None:
+        # Callers hold the lock and an open transaction.
+        self._conn.execute(f"delete from {table}")
+        self._conn.executemany(
+            f"insert into {table} (name, position) values (?, ?)",
+            [(name, index) for index, name in enumerate(names)],
+        )
@@ -0,0 +1,327 @@
+import json
+import os
+import re
+import shlex
+import subprocess
+import threading
+import time
+import uuid
+from typing import List
+
+TASK_BACKENDS = {
+    "local": "本地 task 命令",
+    "shell": "持久 Shell 会话（如 Docker 容器）",
+}
+DEFAULT_SHELL_COMMAND = "docker exec -i task sh"
+
+READ_CHUNK = 65536
+
+# Taskwarrior 2.x file locks and the Taskwarrior 3 sqlite replica.
+LOCK_CONFLICT = re.compile(r"\block(ed)?\b|database is busy", re.IGNORECASE)
+FRIENDLY_ERRORS = (
+    (LOCK_CONFLICT, "Taskwarrior 的数据正被其他程序占用（例如终端里的 task 命令或同步），请稍后再试。"),
+    (re.compile(r"No tasks specified|No matches", re.IGNORECASE), "找不到要操作的任务，它可能已在别处被删除或修改。"),
+    (re.compile(r"is not a valid date|Could not parse", re.IGNORECASE), "Taskwarrior 无法识别其中的日期。"),
+)
+
+
+class TaskwarriorError(RuntimeError):
+    """A failed Taskwarrior command.
+
+    ``str()`` is a message for the user; ``details`` keeps Taskwarrior's own output.
+    """
+
+    def __init__(self, details: str) -> None:
+        self.details = (details or "").strip() or "Taskwarrior command failed"
+        super().__init__(friendly_message(self.details))
+
+    @property
+    def is_lock_conflict(self) -> bool:
+        return LOCK_CONFLICT.search(self.details) is not None
+
+
+def friendly_message(details: str) -> str:
+    for pattern, message in FRIENDLY_ERRORS:
+        if pattern.search(details):
+            return f"{message}\n\n{details}"
+    return details
+
+
+class TaskBackend:
+    """Runs one Taskwarrior command; ``args`` exclude the ``task`` binary itself.
+
+    Failures raise ``TaskwarriorError``. ``local_files`` is false when the
+    paths Taskwarrior reports (``rc.data.location``) do not exist on this
+    machine, e.g. inside a container.
+    """
+
+    local_files = True
+
+    def run(self, args: List[str], input: str | None = None) -> str:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class LocalTaskBackend(TaskBackend):
+    def __init__(self, task_binary: str = "task") -> None:
+        self.task_binary = task_binary
+
+    def run(self, args: List[str], input: str | None = None) -> str:
+        try:
+            result = subprocess.run(
+                [self.task_binary] + args,
+                input=input,
+                capture_output=True,
+                text=True,
+                encoding="utf-8",
+            )
+        except FileNotFoundError:
+            raise TaskwarriorError(f"找不到 {self.task_binary} 命令，请确认已安装 Taskwarrior 并加入 PATH。")
+        if result.returncode != 0:
+            raise TaskwarriorError(result.stderr)
+        return result.stdout
+
+
+class ShellSessionBackend(TaskBackend):
+    """Streams commands through one long-lived POSIX shell.
+
+    ``shell_command`` starts the shell, e.g. ``sh`` or
+    ``docker exec -i task sh``, so each command costs a line on a pipe instead
+    of a new process (or a new ``docker exec``). After every command the shell
+    prints a random marker with the exit status, followed by the command's
+    stderr (kept in a temp file) and the marker again, which frames the output
+    without any escaping.
+    """
+
+    local_files = False
+
+    def __init__(self, shell_command: str = "sh", task_binary: str = "task") -> None:
+        self.shell_command = shell_command
+        self.task_binary = task_binary
+        self._process: subprocess.Popen | None = None
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+
+    def run(self, args: List[str], input: str | None = None) -> str:
+        with self._lock:
+            process = self._ensure_process()
+            marker = f"__TASKGUI_{uuid.uuid4().hex}__"
+            command = " ".join(shlex.quote(part) for part in [self.task_binary] + args)
+            if input is None:
+                script = f"{command} </dev/null 2>\"$TASKGUI_ERR\"\n"
+            else:
+                # A quoted heredoc passes the input through untouched.
+                if not input.endswith("\n"):
+                    input += "\n"
+                script = f"{command} 2>\"$TASKGUI_ERR\" <<'{marker}'\n{input}{marker}\n"
+            script += f"printf '%s %d\\n' '{marker}' \"$?\"; cat \"$TASKGUI_ERR\"; printf '%s\\n' '{marker}'\n"
+            try:
+                process.stdin.write(script.encode("utf-8"))
+                process.stdin.flush()
+                stdout, status_line = self._read_until(process, marker)
+                stderr, _ = self._read_until(process, marker)
+            except (OSError, EOFError):
+                self._kill()
+                raise TaskwarriorError(f"Taskwarrior 会话已断开：{self.shell_command}")
+        returncode = int(status_line or 1)
+        if returncode != 0:
+            raise TaskwarriorError(stderr)
+        return stdout
+
+    def close(self) -> None:
+        with self._lock:
+            if self._process is None:
+                return
+            try:
+                self._process.stdin.write(b'rm -f "$TASKGUI_ERR"; exit\n')
+                self._process.stdin.close()
+                self._process.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                self._kill()
+            self._process = None
+
+    def _ensure_process(self) -> subprocess.Popen:
+        if self._process is not None and self._process.poll() is None:
+            return self._process
+        self._process = subprocess.Popen(
+            shlex.split(self.shell_command),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._process.stdin.write(b'TASKGUI_ERR=$(mktemp 2>/dev/null || echo /tmp/taskgui.$$.err)\n')
+        self._process.stdin.flush()
+        self._buffer = bytearray()
+        return self._process
+
+    def _read_until(self, process: subprocess.Popen, marker: str) -> tuple[str, str]:
+        """Return the output before the next ``marker`` line and the rest of that line."""
+        token = marker.encode("ascii")
+        buffer = self._buffer
+        start = 0
+        while True:
+            index = buffer.find(token, start)
+            if index >= 0:
+                line_end = buffer.find(b"\n", index)
+                if line_end >= 0:
+                    output = bytes(buffer[:index])
+                    rest = bytes(buffer[index + len(token):line_end]).strip()
+                    del buffer[:line_end + 1]
+                    return output.decode("utf-8", errors="replace"), rest.decode("ascii", errors="replace")
+            start = max(0, len(buffer) - len(token))
+            chunk = os.read(process.stdout.fileno(), READ_CHUNK)
+            if not chunk:
+                raise EOFError()
+            buffer += chunk
+
+    def _kill(self) -> None:
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+
+
+class FakeTaskBackend(TaskBackend):
+    """In-memory stand-in for Taskwarrior, for tests; not offered in the settings.
+
+    Understands the commands ``TaskService`` issues: export and count with
+    status, ``modified.after``, ``end``, ``<attribute>.is``, ``<attribute>:``,
+    uuid and parenthesised ``or`` filters, add, import, done, modify, delete
+    and ``_get``. Other filters are ignored. Nothing is persisted.
+    """
+
+    COMMANDS = ("done", "modify", "delete")
+    local_files = False
+
+    def __init__(self, tasks: List[dict] | None = None) -> None:
+        self.tasks: dict[str, dict] = {}
+        self.commands: List[List[str]] = []
+        for task in tasks or []:
+            self._store(dict(task))
+
+    def run(self, args: List[str], input: str | None = None) -> str:
+        args = [arg for arg in args if not arg.startswith("rc.")]
+        self.commands.append(args)
+        if not args:
+            return ""
+        if args[0] == "_get":
+            return ""
+        if args[-1] == "export":
+            return json.dumps(self._select(args[:-1]), ensure_ascii=False)
+        if args[-1] == "count":
+            return f"{len(self._select(args[:-1]))}\n"
+        if args[0] == "add":
+            task = {"description": "", "status": "pending"}
+            words = []
+            for arg in args[1:]:
+                name, sep, value = arg.partition(":")
+                if sep and name.isidentifier():
+                    task[name] = value
+                else:
+                    words.append(arg)
+            task["description"] = " ".join(words)
+            self._store(task)
+            return ""
+        if args[0] == "import":
+            for task in _parse_import(input or ""):
+                self._store(task)
+            return ""
+        for index, arg in enumerate(args):
+            if arg in self.COMMANDS:
+                targets = self._select(args[:index])
+                if not targets:
+                    raise TaskwarriorError("No tasks specified.")
+                for task in targets:
+                    self._apply(task, arg, args[index + 1:])
+                return ""
+        raise TaskwarriorError(f"Unsupported command: {' '.join(args)}")
+
+    def _store(self, task: dict) -> None:
+        task.setdefault("uuid", str(uuid.uuid4()))
+        task.setdefault("status", "pending")
+        task.setdefault("entry", _now())
+        task["modified"] = _now()
+        self.tasks[task["uuid"]] = task
+
+    def _select(self, filters: List[str]) -> List[dict]:
+        tasks = list(self.tasks.values())
+        refs = []
+        groups: List[List[str]] = []
+        group: List[str] | None = None
+        for arg in filters:
+            if arg == "(":
+                group = []
+            elif arg == ")":
+                groups.append(group or [])
+                group = None
+            elif group is not None:
+                if arg != "or":
+                    group.append(arg)
+            elif ":" in arg:
+                groups.append([arg])
+            else:
+                refs.append(arg)
+        if refs:
+            tasks = [task for task in tasks if task["uuid"] in refs]
+        for group in groups:
+            tasks = [task for task in tasks if any(_filter_matches(task, arg) for arg in group)]
+        ids = {task_uuid: index + 1 for index, task_uuid in enumerate(
+            task_uuid for task_uuid, task in self.tasks.items() if task.get("status") == "pending"
+        )}
+        return [dict(task, id=ids.get(task["uuid"], 0)) for task in tasks]
+
+    def _apply(self, task: dict, command: str, mods: List[str]) -> None:
+        task = self.tasks[task["uuid"]]
+        if command == "done":
+            task["status"] = "completed"
+            task["end"] = _now()
+        elif command == "delete":
+            task["status"] = "deleted"
+        else:
+            for mod in mods:
+                name, _, value = mod.partition(":")
+                if value:
+                    task[name] = value
+                else:
+                    task.pop(name, None)
+                if name == "status" and value == "pending":
+                    task.pop("end", None)
+        task["modified"] = _now()
+
+
+def create_backend(name: str, shell_command: str = "") -> TaskBackend:
+    if name == "shell":
+        return ShellSessionBackend(shell_command or DEFAULT_SHELL_COMMAND)
+    return LocalTaskBackend()
+
+
+def _filter_matches(task: dict, arg: str) -> bool:
+    name, _, value = arg.partition(":")
+    if name == "status":
+        return task.get("status") == value
+    if name == "status.not":
+        return task.get("status") != value
+    if name in ("modified.after", "end.after"):
+        return task.get(name.split(".")[0], "") > value
+    if name == "end.before":
+        return "" < task.get("end", "") < value
+    if name.endswith(".is"):
+        return task.get(name[:-len(".is")], "") == value
+    if "." not in name and not value:
+        return not task.get(name)
+    return True
+
+
+def _parse_import(data: str) -> List[dict]:
+    data = data.strip()
+    if not data:
+        return []
+    if data.startswith("["):
+        return json.loads(data)
+    return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+
+def _now() -> str:
+    return time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
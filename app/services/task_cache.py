@@ -0,0 +1,103 @@
+import json
+import os
+import sqlite3
+from typing import Iterable, List
+
+
+class TaskCache:
+    """Persistent copy of Taskwarrior's export, keyed by uuid.
+
+    Each row keeps the raw export record together with its ``modified`` stamp,
+    so ``TaskService`` can ask Taskwarrior only for tasks changed after the
+    highest stamp seen so far.
+    """
+
+    def __init__(self, db_path: str | None = None) -> None:
+        self.db_path = db_path or os.path.join(os.getcwd(), "task_cache.db")
+        self._ensure_db()
+
+    def get_watermark(self) -> str:
+        with self._connect() as conn:
+            row = conn.execute(
+                "select value from sync_state where key = 'watermark'"
+            ).fetchone()
+        return row[0] if row else ""
+
+    def load_tasks(self, completed_after: str = "") -> List[dict]:
+        """Load cached records, skipping completed tasks that ended at or before ``completed_after``."""
+        query = "select data from tasks"
+        params: tuple = ()
+        if completed_after:
+            query += (
+                " where json_extract(data, '$.status') is not 'completed'"
+                " or json_extract(data, '$.end') > ?"
+            )
+            params = (completed_after,)
+        with self._connect() as conn:
+            rows = conn.execute(query + " order by rowid asc", params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def merge(self, raw_tasks: Iterable[dict], advance_watermark: bool = True) -> str:
+        """Store exported records; ``advance_watermark=False`` keeps the delta-sync point."""
+        upserts = []
+        removals = []
+        watermark = self.get_watermark()
+        for item in raw_tasks:
+            task_uuid = item.get("uuid")
+            if not task_uuid:
+                continue
+            modified = item.get("modified") or item.get("entry") or ""
+            if modified > watermark:
+                watermark = modified
+            if item.get("status") == "deleted":
+                removals.append((task_uuid,))
+            else:
+                upserts.append((task_uuid, modified, json.dumps(item, ensure_ascii=False)))
+        with self._connect() as conn:
+            conn.executemany("delete from tasks where uuid = ?", removals)
+            conn.executemany(
+                """
+                insert into tasks (uuid, modified, data) values (?, ?, ?)
+                on conflict(uuid) do update set
+                    modified = excluded.modified,
+                    data = excluded.data
+                """,
+                upserts,
+            )
+            if advance_watermark:
+                conn.execute(
+                    """
+                    insert into sync_state (key, value) values ('watermark', ?)
+                    on conflict(key) do update set value = excluded.value
+                    """,
+                    (watermark,),
+                )
+        return watermark
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("delete from tasks")
+            conn.execute("delete from sync_state")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def _ensure_db(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                create table if not exists tasks (
+                    uuid text primary key,
+                    modified text not null,
+                    data text not null
+                )
+                """
+            )
+            conn.execute(
+                """
+                create table if not exists sync_state (
+                    key text primary key,
+                    value text not null
+                )
+                """
+            )
@@ -0,0 +1,144 @@
+import csv
+import json
+import os
+import time
+from datetime import date
+from typing import Callable, Iterable
+
+from app.models import PRIORITY_LABELS, TaskItem, normalize_task_type
+
+EXPORT_HEADERS = [
+    "任务",
+    "类型",
+    "状态",
+    "自定义状态",
+    "优先级",
+    "截止日期",
+    "完成时间",
+    "链接",
+    "备注",
+    "项目",
+    "UUID",
+]
+
+EXPORT_FORMATS = {
+    ".xlsx": "Excel Workbook (*.xlsx)",
+    ".csv": "CSV (*.csv)",
+    ".jsonl": "JSON Lines (*.jsonl)",
+}
+
+PROGRESS_STEP = 500
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def task_to_row(task: TaskItem) -> list[str]:
+    priority_label = PRIORITY_LABELS.get((task.priority or "").upper(), task.priority or "")
+    priority_text = ""
+    if task.priority:
+        priority_text = f"{task.priority} · {priority_label}" if priority_label else task.priority
+    due_value = ""
+    if task.due_day is not None:
+        due_value = date.fromordinal(task.due_day).isoformat()
+    completed_value = ""
+    if task.end_ts is not None:
+        completed_value = time.strftime("%Y-%m-%d %H:%M", time.localtime(task.end_ts))
+    return [
+        task.description,
+        normalize_task_type(task.xtype),
+        task.task_state,
+        task.xstatus,
+        priority_text,
+        due_value,
+        completed_value,
+        task.link,
+        task.note,
+        task.project,
+        task.uuid,
+    ]
+
+
+def export_tasks(
+    path: str,
+    tasks: Iterable[TaskItem],
+    total: int = 0,
+    progress: Callable[[int, int], None] | None = None,
+    is_cancelled: Callable[[], bool] | None = None,
+) -> int:
+    """Stream ``tasks`` to ``path`` as xlsx, CSV or JSONL, chosen by extension.
+
+    Rows are written one at a time (openpyxl write-only mode for xlsx) into a
+    temporary file that replaces ``path`` only when the export completes, so a
+    cancelled or failed export leaves nothing behind.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"不支持的导出格式：{extension or path}")
+    temp_path = f"{path}.part"
+    rows = _iter_rows(tasks, total, progress, is_cancelled)
+    try:
+        if extension == ".xlsx":
+            count = _write_xlsx(temp_path, rows)
+        elif extension == ".csv":
+            count = _write_csv(temp_path, rows)
+        else:
+            count = _write_jsonl(temp_path, rows)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return count
+
+
+def _iter_rows(tasks, total, progress, is_cancelled):
+    done = 0
+    for task in tasks:
+        if is_cancelled is not None and done % PROGRESS_STEP == 0 and is_cancelled():
+            raise ExportCancelled()
+        yield task_to_row(task)
+        done += 1
+        if progress is not None and done % PROGRESS_STEP == 0:
+            progress(done, total)
+    if progress is not None:
+        progress(done, total)
+
+
+def _write_xlsx(path: str, rows) -> int:
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("缺少 openpyxl 依赖，请先安装：pip install openpyxl")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Tasks")
+    sheet.append(EXPORT_HEADERS)
+    count = 0
+    for row in rows:
+        sheet.append(row)
+        count += 1
+    workbook.save(path)
+    return count
+
+
+def _write_csv(path: str, rows) -> int:
+    count = 0
+    # utf-8-sig so Excel opens the Chinese headers correctly.
+    with open(path, "w", newline="", encoding="utf-8-sig") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(EXPORT_HEADERS)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _write_jsonl(path: str, rows) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps(dict(zip(EXPORT_HEADERS, row)), ensure_ascii=False))
+            handle.write("\n")
+            count += 1
+    return count
@@ -0,0 +1,285 @@
+import csv
+import json
+import os
+import time
+import uuid
+from datetime import date, datetime
+from typing import Callable, Iterator
+
+from app.models import PRIORITY_LABELS, format_timestamp, normalize_task_type
+from app.services.task_export import EXPORT_FORMATS, EXPORT_HEADERS, PROGRESS_STEP
+
+IMPORT_FORMATS = EXPORT_FORMATS
+IMPORT_STATES = ("pending", "completed")
+# Exported states Taskwarrior derives from wait/recur, which the file has no
+# columns for; update rows keep the task's current status instead.
+KEPT_STATES = ("waiting", "recurring")
+# Issues listed in the preview; the rest are only counted.
+MAX_REPORTED_ISSUES = 200
+# Columns an update row clears when the cell is empty (column -> attribute).
+CLEARABLE_COLUMNS = {
+    "类型": "xtype",
+    "自定义状态": "xstatus",
+    "截止日期": "due",
+    "链接": "link",
+    "备注": "xdesc",
+    "项目": "project",
+}
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+class ImportPlan:
+    """Validated rows of an import file, ready for ``TaskService.import_records``.
+
+    ``records`` are Taskwarrior import records; rows that failed validation
+    are skipped and described in ``issues`` as ``(row number, message)``.
+    Records for update rows carry ``""`` for emptied columns, which
+    ``import_records`` turns into a removed attribute.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.rows = 0
+        self.records: list[dict] = []
+        self.issues: list[tuple[int, str]] = []
+        self.skipped = 0
+        # Rows that named a task by UUID; it may or may not exist yet.
+        self.update_uuids: list[str] = []
+        # How many of them name an existing task (see TaskService.plan_import);
+        # the rest create a task with that UUID.
+        self.existing_updates = 0
+
+    @property
+    def updates(self) -> int:
+        return self.existing_updates
+
+    @property
+    def additions(self) -> int:
+        return len(self.records) - self.updates
+
+    def add_issue(self, row: int, message: str) -> None:
+        self.skipped += 1
+        if len(self.issues) < MAX_REPORTED_ISSUES:
+            self.issues.append((row, message))
+
+
+def read_import_file(
+    path: str,
+    progress: Callable[[int, int], None] | None = None,
+    is_cancelled: Callable[[], bool] | None = None,
+) -> ImportPlan:
+    """Read and validate ``path`` (xlsx, CSV or JSONL) without touching Taskwarrior.
+
+    Columns are matched by the headers ``export_tasks`` writes, so exported
+    files import back unchanged; rows with a UUID update that task. The
+    result is the dry-run preview; nothing is written.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in IMPORT_FORMATS:
+        raise ValueError(f"不支持的导入格式：{extension or path}")
+    if extension == ".xlsx":
+        rows, total = _read_xlsx(path)
+    elif extension == ".csv":
+        rows, total = _read_csv(path), 0
+    else:
+        rows, total = _read_jsonl(path), 0
+    plan = ImportPlan(path)
+    now = format_timestamp(int(time.time()))
+    seen_uuids: set[str] = set()
+    for row_number, row in rows:
+        if is_cancelled is not None and plan.rows % PROGRESS_STEP == 0 and is_cancelled():
+            raise ImportCancelled()
+        if row is None:
+            plan.rows += 1
+            plan.add_issue(row_number, "无法解析该行")
+            continue
+        try:
+            record = row_to_record(row, now)
+        except ValueError as exc:
+            plan.rows += 1
+            plan.add_issue(row_number, str(exc))
+            continue
+        if record is None:
+            continue
+        plan.rows += 1
+        if "uuid" in record:
+            if record["uuid"] in seen_uuids:
+                plan.add_issue(row_number, f"UUID 重复：{record['uuid']}")
+                continue
+            seen_uuids.add(record["uuid"])
+            plan.update_uuids.append(record["uuid"])
+        else:
+            record["uuid"] = str(uuid.uuid4())
+        plan.records.append(record)
+        if progress is not None and plan.rows % PROGRESS_STEP == 0:
+            progress(plan.rows, total)
+    if progress is not None:
+        progress(plan.rows, total)
+    return plan
+
+
+def row_to_record(row: dict, now: str) -> dict | None:
+    """Turn one row keyed by ``EXPORT_HEADERS`` into an import record.
+
+    Returns ``None`` for a blank row and raises ``ValueError`` for an invalid one.
+    """
+    values = {header: _cell_text(row.get(header)) for header in EXPORT_HEADERS}
+    if not any(values.values()):
+        return None
+    description = values["任务"]
+    if not description:
+        raise ValueError("缺少任务内容")
+    task_uuid = ""
+    if values["UUID"]:
+        try:
+            task_uuid = str(uuid.UUID(values["UUID"]))
+        except ValueError:
+            raise ValueError(f"UUID 格式不正确：{values['UUID']}")
+    state = values["状态"]
+    if state in KEPT_STATES:
+        if not task_uuid:
+            raise ValueError(f"没有 UUID 的行不能导入为 {state} 状态")
+        state = ""
+    elif state and state not in IMPORT_STATES:
+        raise ValueError(f"无法识别的状态：{state}")
+    if not task_uuid:
+        state = state or "pending"
+    record = {"description": description}
+    if state:
+        # Update rows without a state keep the task's current one.
+        record["status"] = state
+    xtype = normalize_task_type(values["类型"])
+    if xtype:
+        record["xtype"] = xtype
+    if values["自定义状态"]:
+        record["xstatus"] = values["自定义状态"]
+    priority = _parse_priority(values["优先级"])
+    if priority:
+        record["priority"] = priority
+    if values["截止日期"]:
+        record["due"] = _parse_date(row.get("截止日期"), "截止日期", hour=12)
+    if state == "completed":
+        if values["完成时间"]:
+            record["end"] = _parse_date(row.get("完成时间"), "完成时间")
+        elif not task_uuid:
+            # Update rows keep the current end; import_records fills it in if there is none.
+            record["end"] = now
+    elif state == "pending" and task_uuid:
+        # Reopening a task drops its completion time.
+        record["end"] = ""
+    if values["链接"]:
+        record["link"] = values["链接"]
+    if values["备注"]:
+        record["xdesc"] = values["备注"]
+    if values["项目"]:
+        record["project"] = values["项目"]
+    if task_uuid:
+        record["uuid"] = task_uuid
+        # An emptied cell clears the attribute; a column the file lacks keeps it.
+        for column, attribute in CLEARABLE_COLUMNS.items():
+            if column in row and attribute not in record:
+                record[attribute] = ""
+    else:
+        record["entry"] = now
+    return record
+
+
+def _parse_priority(text: str) -> str:
+    if not text:
+        return ""
+    # Exported as "H · 紧急"; accept the code or the label alone as well.
+    code = text.split("·")[0].strip().upper()
+    if code in PRIORITY_LABELS:
+        return code
+    for key, label in PRIORITY_LABELS.items():
+        if text.strip() == label:
+            return key
+    raise ValueError(f"无法识别的优先级：{text}")
+
+
+def _parse_date(value, column: str, hour: int | None = None) -> str:
+    """Parse a local date or date-time cell into Taskwarrior's UTC form.
+
+    Date-only values get ``hour`` (the app stores due dates at noon).
+    """
+    if isinstance(value, datetime):
+        parsed = value
+        if hour is not None and parsed.time() == datetime.min.time():
+            # Excel date cells come back as midnight.
+            parsed = parsed.replace(hour=hour)
+    elif isinstance(value, date):
+        parsed = datetime(value.year, value.month, value.day, hour or 0)
+    else:
+        text = _cell_text(value)
+        for pattern in ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y/%m/%d"):
+            try:
+                parsed = datetime.strptime(text, pattern)
+            except ValueError:
+                continue
+            if "%H" not in pattern and hour is not None:
+                parsed = parsed.replace(hour=hour)
+            break
+        else:
+            raise ValueError(f"{column}格式不正确：{text}")
+    return format_timestamp(int(time.mktime(parsed.timetuple())))
+
+
+def _cell_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).strip()
+
+
+def _check_headers(headers) -> None:
+    if "任务" not in headers:
+        raise ValueError("文件第一行缺少“任务”列，请使用导出文件的表头")
+
+
+def _read_xlsx(path: str) -> tuple[Iterator[tuple[int, dict]], int]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise RuntimeError("缺少 openpyxl 依赖，请先安装：pip install openpyxl")
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    sheet = workbook.active
+    total = max((sheet.max_row or 1) - 1, 0)
+
+    def rows():
+        try:
+            values = sheet.iter_rows(values_only=True)
+            headers = [_cell_text(cell) for cell in next(values, ())]
+            _check_headers(headers)
+            for index, cells in enumerate(values, start=2):
+                yield index, dict(zip(headers, cells))
+        finally:
+            workbook.close()
+
+    return rows(), total
+
+
+def _read_csv(path: str) -> Iterator[tuple[int, dict]]:
+    # utf-8-sig also accepts the BOM export_tasks writes for Excel.
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.DictReader(handle)
+        _check_headers(reader.fieldnames or [])
+        for index, row in enumerate(reader, start=2):
+            yield index, row
+
+
+def _read_jsonl(path: str) -> Iterator[tuple[int, dict | None]]:
+    with open(path, encoding="utf-8") as handle:
+        for index, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield index, row if isinstance(row, dict) else None
@@ -0,0 +1,133 @@
+import json
+import os
+import re
+import sqlite3
+from typing import List
+
+from app.models import format_timestamp
+
+READ_BACKENDS = {
+    "cli": "Taskwarrior 命令（task export）",
+    "direct": "直接读取数据文件（只读）",
+}
+
+TASKCHAMPION_DB = "taskchampion.sqlite3"
+# Attributes Taskwarrior stores as epoch seconds; export renders them as dates.
+DATE_ATTRIBUTES = ("entry", "modified", "due", "end", "start", "wait", "scheduled", "until")
+
+F4_ATTRIBUTE = re.compile(r'([^\s:"]+):"([^"\\]*(?:\\.[^"\\]*)*)"')
+F4_ENTITIES = (("&open;", "["), ("&close;", "]"), ("&dquot;", '"'))
+
+
+def read_task_data(location: str) -> List[dict]:
+    """Read every task under ``location`` without running ``task``.
+
+    Uses the Taskwarrior 3 ``taskchampion.sqlite3`` replica when present,
+    otherwise the 2.x ``pending.data``/``completed.data`` files. Records come
+    back shaped like ``task export`` output.
+    """
+    db_path = os.path.join(location, TASKCHAMPION_DB)
+    if os.path.exists(db_path):
+        return read_taskchampion(db_path)
+    pending_path = os.path.join(location, "pending.data")
+    if os.path.exists(pending_path):
+        return read_data_files(location)
+    raise RuntimeError(f"在 {location} 中找不到 Taskwarrior 数据文件")
+
+
+def read_taskchampion(path: str) -> List[dict]:
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=5)
+    try:
+        rows = conn.execute("select uuid, data from tasks").fetchall()
+        working_set = dict(
+            (row[1], row[0])
+            for row in conn.execute("select id, uuid from working_set where uuid is not null")
+        )
+    finally:
+        conn.close()
+    tasks = []
+    for task_uuid, data in rows:
+        try:
+            attributes = json.loads(data)
+        except ValueError:
+            continue
+        task = _to_export_record(attributes)
+        task["uuid"] = task_uuid
+        task["id"] = working_set.get(task_uuid, 0)
+        tasks.append(task)
+    # Working-set tasks first, in id order, like ``task export``.
+    tasks.sort(key=lambda task: (task["id"] == 0, task["id"], task.get("entry", "")))
+    return tasks
+
+
+def read_data_files(location: str) -> List[dict]:
+    tasks = []
+    for name, numbered in (("pending.data", True), ("completed.data", False)):
+        path = os.path.join(location, name)
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as handle:
+            task_id = 0
+            for line in handle:
+                attributes = parse_f4_line(line)
+                if not attributes.get("uuid"):
+                    continue
+                task = _to_export_record(attributes)
+                if numbered:
+                    task_id += 1
+                    task["id"] = task_id
+                else:
+                    task["id"] = 0
+                tasks.append(task)
+    return tasks
+
+
+def parse_f4_line(line: str) -> dict[str, str]:
+    """Parse one ``[name:"value" ...]`` line of a Taskwarrior 2.x data file."""
+    line = line.strip()
+    if not (line.startswith("[") and line.endswith("]")):
+        return {}
+    attributes = dict(F4_ATTRIBUTE.findall(line, 1, len(line) - 1))
+    for name, value in attributes.items():
+        # Most values need no decoding; only touch the ones that do.
+        if "\\" in value:
+            try:
+                value = json.loads(f'"{value}"')
+            except ValueError:
+                pass
+        if "&" in value:
+            for entity, char in F4_ENTITIES:
+                value = value.replace(entity, char)
+        attributes[name] = value
+    return attributes
+
+
+def _to_export_record(attributes: dict[str, str]) -> dict:
+    task = attributes
+    tags = task.pop("tags", "")
+    tags = [tag for tag in tags.split(",") if tag] if tags else []
+    annotations = []
+    for name in [name for name in task if "_" in name]:
+        if name.startswith("tag_"):
+            del task[name]
+            tags.append(name[len("tag_"):])
+        elif name.startswith("annotation_"):
+            annotations.append({"entry": _format_epoch(name[len("annotation_"):]), "description": task.pop(name)})
+    for name in DATE_ATTRIBUTES:
+        value = task.get(name)
+        if value:
+            task[name] = _format_epoch(value)
+    if tags:
+        # Taskwarrior 2.6 writes each tag to both the list and a tag_<name> attribute.
+        task["tags"] = list(dict.fromkeys(tags))
+    if annotations:
+        task["annotations"] = annotations
+    return task
+
+
+def _format_epoch(value: str) -> str:
+    try:
+        return format_timestamp(int(value))
+    except (TypeError, ValueError):
+        # Already a date string (or garbage); let the TaskItem parser decide.
+        return value
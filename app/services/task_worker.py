@@ -0,0 +1,110 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class _JobSignals(QObject):
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal()
+
+
+class TaskJob(QRunnable):
+    """One call into ``TaskService`` executed on the worker thread.
+
+    Results are delivered through Qt signals, so handlers always run on the GUI
+    thread. A cancelled job that has not started is dropped from the queue; one
+    that is already running completes, but its result is discarded.
+    """
+
+    def __init__(self, fn, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _JobSignals()
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def is_cancelled(self) -> bool:
+        return self.cancelled
+
+    def report_progress(self, done: int, total: int) -> None:
+        if not self.cancelled:
+            self.signals.progress.emit(done, total)
+
+    def run(self) -> None:
+        try:
+            if self.cancelled:
+                return
+            try:
+                result = self.fn(*self.args, **self.kwargs)
+            except Exception as exc:
+                if not self.cancelled:
+                    self.signals.failed.emit(str(exc))
+                return
+            if not self.cancelled:
+                self.signals.succeeded.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+class TaskWorker(QObject):
+    """Runs Taskwarrior I/O off the GUI thread.
+
+    A single worker thread is used so commands keep the order they were
+    submitted in and never contend for Taskwarrior's data lock.
+    """
+
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._jobs: set[TaskJob] = set()
+
+    def submit(self, fn, *args, on_success=None, on_error=None, on_progress=None, **kwargs) -> TaskJob:
+        """Queue ``fn(*args, **kwargs)``.
+
+        With ``on_progress`` the call also receives ``progress(done, total)``
+        and ``is_cancelled()`` keyword arguments for long-running work.
+        """
+        job = TaskJob(fn, args, kwargs)
+        if on_progress is not None:
+            kwargs["progress"] = job.report_progress
+            kwargs["is_cancelled"] = job.is_cancelled
+            job.signals.progress.connect(on_progress)
+        if on_success is not None:
+            job.signals.succeeded.connect(on_success)
+        if on_error is not None:
+            job.signals.failed.connect(on_error)
+        job.signals.finished.connect(lambda job=job: self._on_job_finished(job))
+        was_idle = not self._jobs
+        self._jobs.add(job)
+        self.pool.start(job)
+        if was_idle:
+            self.busy_changed.emit(True)
+        return job
+
+    def cancel(self, job: TaskJob | None) -> None:
+        if job is None or job not in self._jobs:
+            return
+        job.cancel()
+        if self.pool.tryTake(job):
+            self._on_job_finished(job)
+
+    def is_busy(self) -> bool:
+        return bool(self._jobs)
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self.pool.waitForDone(msecs)
+
+    def _on_job_finished(self, job: TaskJob) -> None:
+        if job not in self._jobs:
+            return
+        self._jobs.discard(job)
+        if not self._jobs:
+            self.busy_changed.emit(False)
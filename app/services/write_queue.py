@@ -0,0 +1,93 @@
+import threading
+from typing import Iterable, List
+
+# Kinds of queued write; "modify" carries ``MODIFY_FIELDS`` changes.
+WRITE_KINDS = ("modify", "complete", "reopen", "delete")
+# Cancelling pairs: the second undoes the first.
+OPPOSITE_KINDS = {"complete": "reopen", "reopen": "complete"}
+
+
+class WriteOperation:
+    """One write the UI asked for, on one or more tasks."""
+
+    __slots__ = ("kind", "task_uuids", "changes")
+
+    def __init__(self, kind: str, task_uuids: Iterable[str], changes: dict[str, str] | None = None) -> None:
+        if kind not in WRITE_KINDS:
+            raise ValueError(f"Unknown write: {kind}")
+        self.kind = kind
+        self.task_uuids = list(dict.fromkeys(task_uuids))
+        self.changes = dict(changes or {})
+
+
+class WriteResult:
+    """Outcome of one ``WriteOperation``; ``error`` is ``None`` when it went through."""
+
+    __slots__ = ("operation", "error")
+
+    def __init__(self, operation: WriteOperation, error: str | None = None) -> None:
+        self.operation = operation
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class WriteQueue:
+    """Thread-safe FIFO of ``WriteOperation``s waiting to be flushed."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._operations: List[WriteOperation] = []
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._operations)
+
+    def put(self, operation: WriteOperation) -> None:
+        with self._lock:
+            self._operations.append(operation)
+
+    def take(self) -> List[WriteOperation]:
+        with self._lock:
+            operations, self._operations = self._operations, []
+        return operations
+
+
+def merge_operations(operations: Iterable[WriteOperation]) -> List[tuple[str, dict[str, str], List[str]]]:
+    """Collapse operations into the fewest commands with the same end result.
+
+    Per task: modifies are folded together (later values win), a complete
+    followed by a reopen (or the reverse) cancels out, and a delete drops
+    everything queued for that task before or after it. Tasks needing the
+    same command are grouped. Returns ``(kind, changes, task_uuids)`` groups,
+    modifies first so they land before the task changes state.
+    """
+    changes: dict[str, dict[str, str]] = {}
+    states: dict[str, str | None] = {}
+    for operation in operations:
+        for task_uuid in operation.task_uuids:
+            state = states.get(task_uuid)
+            if state == "delete":
+                continue
+            if operation.kind == "modify":
+                changes.setdefault(task_uuid, {}).update(operation.changes)
+            elif operation.kind == "delete":
+                states[task_uuid] = "delete"
+                changes.pop(task_uuid, None)
+            elif state == OPPOSITE_KINDS[operation.kind]:
+                states[task_uuid] = None
+            else:
+                states[task_uuid] = operation.kind
+
+    groups: dict[tuple, tuple[str, dict[str, str], List[str]]] = {}
+    for task_uuid, task_changes in changes.items():
+        if task_changes:
+            key = ("modify",) + tuple(sorted(task_changes.items()))
+            groups.setdefault(key, ("modify", task_changes, []))[2].append(task_uuid)
+    for kind in ("complete", "reopen", "delete"):
+        task_uuids = [task_uuid for task_uuid, state in states.items() if state == kind]
+        if task_uuids:
+            groups[(kind,)] = (kind, {}, task_uuids)
+    return list(groups.values())
@@ -0,0 +1,32 @@
+from functools import lru_cache
+
+from PyQt6.QtGui import QIcon, QPixmap
+
+_qta = None
+_qta_loaded = False
+
+
+def _qtawesome():
+    # Importing qtawesome loads its icon fonts, which is slow; do it on first use.
+    global _qta, _qta_loaded
+    if not _qta_loaded:
+        _qta_loaded = True
+        try:
+            import qtawesome
+        except ImportError:
+            qtawesome = None
+        _qta = qtawesome
+    return _qta
+
+
+@lru_cache(maxsize=None)
+def icon(name: str, color: str) -> QIcon:
+    qta = _qtawesome()
+    if qta is None:
+        return QIcon()
+    return qta.icon(name, color=color)
+
+
+@lru_cache(maxsize=None)
+def pixmap(name: str, color: str, size: int) -> QPixmap:
+    return icon(name, color).pixmap(size, size)
@@ -1,23 +1,27 @@
-from datetime import datetime, timezone
+import os
+import time
+from datetime import date
+from typing import TYPE_CHECKING
 
-from PyQt6.QtCore import QDate, Qt
+from PyQt6.QtCore import QCoreApplication, QDate, Qt, QTimer, pyqtSignal
 import sys
 
-from PyQt6.QtGui import QAction, QColor, QIcon, QKeySequence, QPalette, QShortcut
+from PyQt6.QtGui import QAction, QColor, QKeySequence, QPalette, QShortcut
 from PyQt6.sip import isdeleted
 from PyQt6.QtWidgets import (
-    QCheckBox,
+    QAbstractItemView,
     QComboBox,
     QFrame,
     QFileDialog,
     QHBoxLayout,
     QLabel,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QMainWindow,
+    QMenu,
     QMessageBox,
     QPlainTextEdit,
+    QProgressDialog,
     QPushButton,
     QDateEdit,
     QScrollArea,
@@ -26,213 +30,55 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-try:
-    import qtawesome as qta
-except ImportError:
-    qta = None
-
-
-def _icon(name: str, color: str) -> QIcon:
-    if qta is None:
-        return QIcon()
-    return qta.icon(name, color=color)
-
-from app.models import TaskItem
-from app.services.settings_service import SettingsService
-from app.services.task_service import TaskService
-from app.ui.settings_window import SettingsWindow
-
-PRIORITY_LABELS = {
-    "H": "紧急",
-    "M": "重要",
-    "L": "低优先",
-}
-
-DEFAULT_STATUS_LABEL = "待开始"
-NONE_TYPE_LABEL = "无"
-NONE_STATUS_LABEL = "无状态"
-
-
-def normalize_task_type(value: str) -> str:
-    if not value:
-        return ""
-    value = value.strip()
-    if value == NONE_TYPE_LABEL:
-        return ""
-    return value
-
-
-class TaskListItemWidget(QWidget):
-    def __init__(self, task: TaskItem, on_toggle):
-        super().__init__()
-        self.task = task
-        self.on_toggle = on_toggle
-        self.is_selected = False
-        self.item = None
-        self.list_widget = None
-
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(12, 8, 12, 8)
-        layout.setSpacing(10)
-
-        self.checkbox = QCheckBox()
-        self.checkbox.toggled.connect(self._on_toggled)
-        layout.addWidget(self.checkbox, alignment=Qt.AlignmentFlag.AlignVCenter)
-
-        text_layout = QVBoxLayout()
-        text_layout.setContentsMargins(0, 0, 0, 0)
-        text_layout.setSpacing(2)
-
-        title_text = self._format_title(task)
-        self.title_label = QLabel(title_text)
-        self.title_label.setTextFormat(Qt.TextFormat.PlainText)
-        self.title_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
-        self.title_label.setStyleSheet("color: #1a1d24; font-weight: 600;")
-        text_layout.addWidget(self.title_label)
-
-        effective_priority = task.priority or "L"
-        priority_label = PRIORITY_LABELS.get(effective_priority, effective_priority)
-        priority_text = f"【{priority_label}】" if priority_label else ""
-        status_text = task.xstatus or (DEFAULT_STATUS_LABEL if task.task_state != "completed" else "已完成")
-        link_text = task.link or "无链接"
-        completion_text = ""
-        if task.task_state == "completed":
-            completion_text = self._format_completed(task.end)
-        due_text = self._format_due(task.due)
-        if task.link:
-            meta_html = (
-                f"{priority_text}{status_text}{completion_text}{due_text} · "
-                f"<a href=\"{task.link}\">{link_text}</a>"
-            )
-        else:
-            meta_html = f"{priority_text}{status_text}{completion_text}{due_text} · {link_text}"
-        self.meta_label = QLabel(meta_html)
-        self.meta_label.setTextFormat(Qt.TextFormat.RichText)
-        self.meta_label.setOpenExternalLinks(True)
-        self.meta_label.setStyleSheet("color: #4b5563;")
-        text_layout.addWidget(self.meta_label)
-
-        layout.addLayout(text_layout, stretch=1)
-
-        self.apply_completed_style(task.task_state == "completed")
-        self._install_click_filters()
-        self.setAutoFillBackground(False)
-
-    def bind_item(self, item, list_widget):
-        self.item = item
-        self.list_widget = list_widget
-        self._update_size()
-
-    def set_checked(self, checked: bool):
-        self.checkbox.blockSignals(True)
-        self.checkbox.setChecked(checked)
-        self.checkbox.blockSignals(False)
-
-    def apply_completed_style(self, completed: bool):
-        for label in (self.title_label, self.meta_label):
-            font = label.font()
-            font.setStrikeOut(completed)
-            label.setFont(font)
-        self._apply_text_color()
-
-    def set_selected(self, selected: bool):
-        self.is_selected = selected
-        self._apply_text_color()
-
-    def _apply_text_color(self):
-        if self.is_selected:
-            title_color = "#000000"
-            meta_color = "#000000"
-        elif self.task.task_state == "completed":
-            title_color = "#9aa3b2"
-            meta_color = "#9aa3b2"
-        else:
-            title_color = "#1a1d24"
-            meta_color = "#4b5563"
-        self.title_label.setStyleSheet(f"color: {title_color}; font-weight: 600;")
-        self.meta_label.setStyleSheet(f"color: {meta_color};")
-        self.setStyleSheet("background: transparent;")
-
-    def _on_toggled(self, checked: bool):
-        self.on_toggle(self.task.uuid, checked)
-
-    def _install_click_filters(self):
-        self.installEventFilter(self)
-        self.title_label.installEventFilter(self)
-        self.meta_label.installEventFilter(self)
-
-    def eventFilter(self, obj, event):
-        if event.type() == event.Type.MouseButtonPress:
-            if (
-                self.list_widget is not None
-                and self.item is not None
-                and not isdeleted(self.list_widget)
-                and not isdeleted(self.item)
-            ):
-                self.list_widget.setCurrentItem(self.item)
-        return super().eventFilter(obj, event)
-
-    def _update_size(self):
-        if self.item is not None:
-            self.item.setSizeHint(self.sizeHint())
-
-    @staticmethod
-    def _format_title(task: TaskItem) -> str:
-        xtype = normalize_task_type(task.xtype)
-        if xtype:
-            return f"{xtype}·{task.description}"
-        return task.description or ""
-
-    @staticmethod
-    def _format_due(due_value: str) -> str:
-        if not due_value:
-            return ""
-        parsed = parse_due_date(due_value)
-        if not parsed:
-            return f" · 截止 {due_value}"
-        if TaskListItemWidget._is_same_week(parsed, QDate.currentDate()):
-            weekday = TaskListItemWidget._weekday_label(parsed)
-            return f" · 截止 {parsed.toString('yyyy-MM-dd')} {weekday}"
-        return f" · 截止 {parsed.toString('yyyy-MM-dd')}"
+from app.models import (
+    NONE_STATUS_LABEL,
+    NONE_TYPE_LABEL,
+    PRIORITY_LABELS,
+    TaskFilter,
+    TaskItem,
+    format_timestamp,
+    normalize_task_type,
+    parse_timestamp,
+)
+from app.services.data_watcher import TaskDataWatcher
+from app.services.quick_add import parse_quick_add
+from app.services.search_index import SearchIndex, build_index
+from app.services.settings_service import STATUSES_KEY, TASK_TYPES_KEY, SettingsService
+from app.services.task_backend import create_backend
+from app.services.task_export import EXPORT_FORMATS
+from app.services.task_import import IMPORT_FORMATS, ImportPlan
+from app.services.task_service import TaskService, build_due_value
+from app.services.task_snapshot import TaskSnapshot
+from app.services.task_store import VIEW_STATES, TaskStore
+from app.services.task_worker import TaskJob, TaskWorker
+from app.ui.icons import icon, pixmap
+from app.ui.quick_add_input import QuickAddInput
+from app.ui.task_list import (
+    TaskItemDelegate,
+    TaskListModel,
+    to_qdate,
+)
 
-    @staticmethod
-    def _format_completed(end_value: str) -> str:
-        if not end_value:
-            return ""
-        parsed = parse_task_datetime(end_value)
-        if not parsed:
-            return f" · 完成 {end_value}"
-        if parsed.tzinfo is not None:
-            parsed = parsed.astimezone()
-        return f" · 完成 {parsed.strftime('%Y-%m-%d %H:%M')}"
+if TYPE_CHECKING:
+    from app.ui.settings_window import SettingsWindow
 
-    @staticmethod
-    def _is_same_week(date: QDate, today: QDate) -> bool:
-        if not date.isValid() or not today.isValid():
-            return False
-        date_week = date.weekNumber()
-        today_week = today.weekNumber()
-        return date_week == today_week
-
-    @staticmethod
-    def _weekday_label(date: QDate) -> str:
-        labels = {
-            1: "周一",
-            2: "周二",
-            3: "周三",
-            4: "周四",
-            5: "周五",
-            6: "周六",
-            7: "周日",
-        }
-        return labels.get(date.dayOfWeek(), "")
+# Edits to one task made within this window are sent as a single modify.
+EDIT_COALESCE_MS = 400
 
 
 class MainWindow(QMainWindow):
-    def __init__(self, service: TaskService, settings_service: SettingsService):
+    tasks_loaded = pyqtSignal()
+
+    def __init__(
+        self,
+        service: TaskService,
+        settings_service: SettingsService,
+        snapshot: TaskSnapshot | None = None,
+    ):
         super().__init__()
         self.service = service
         self.settings_service = settings_service
+        self.snapshot = snapshot
         self.setWindowTitle("Taskwarrior 可视化待办")
         self.resize(1200, 720)
 
@@ -241,16 +87,40 @@ class MainWindow(QMainWindow):
         self.expanded_filter: str | None = None
         self.type_options: list[str] = []
         self.status_options: list[str] = []
-        self.tasks_by_uuid: dict[str, TaskItem] = {}
-        self.item_widgets: dict[str, TaskListItemWidget] = {}
-        self.is_populating = False
+        self.store = TaskStore()
+        self.view_tasks: list[TaskItem] = []
+        # uuid -> index in view_tasks, built on demand for in-place updates.
+        self.view_rows: dict[str, int] | None = None
+        self.search_index = SearchIndex()
+        # Built in the background after the first sync, or by the first search.
+        self.search_index_stale = True
+        self.search_index_job: TaskJob | None = None
         self.current_task_uuid: str | None = None
+        self.detail_task: TaskItem | None = None
         self.is_loading_details = False
         self.sidebar_sections: dict[str, dict[str, object]] = {}
-        self.settings_window: SettingsWindow | None = None
+        self.settings_window: "SettingsWindow | None" = None
+        self.icons_ready = False
+        self.field_icons: list[tuple[QLabel, str]] = []
+        self.worker = TaskWorker(self)
+        self.worker.busy_changed.connect(self.on_worker_busy_changed)
+        self.refresh_job: TaskJob | None = None
+        self.history_job: TaskJob | None = None
+        self.data_watcher: TaskDataWatcher | None = None
+        self.pending_writes: dict[str, tuple[object, TaskItem | None]] = {}
+        # Queued WriteOperation -> (pending_writes token, tasks before the write).
+        self.write_callbacks: dict[object, tuple[object, dict[str, TaskItem]]] = {}
+        self.write_job: TaskJob | None = None
+        self.dirty_fields: set[str] = set()
+        self.pending_edits: dict[str, tuple[TaskItem, dict[str, str]]] = {}
+        self.edit_timer = QTimer(self)
+        self.edit_timer.setSingleShot(True)
+        self.edit_timer.setInterval(EDIT_COALESCE_MS)
+        self.edit_timer.timeout.connect(self.flush_pending_edits)
 
         self.reload_type_options()
         self.reload_status_options()
+        self.settings_service.add_listener(self.on_setting_changed)
 
         central = QWidget()
         self.setCentralWidget(central)
@@ -275,12 +145,21 @@ class MainWindow(QMainWindow):
 
         self._build_menu()
         self._setup_macos_shortcuts()
+        self.restore_snapshot()
         self.refresh_tasks()
+        # qtawesome's fonts load on first use; let the window paint before that.
+        QTimer.singleShot(0, self.load_icons)
+        self.watch_data_location()
 
     def _build_menu(self):
         refresh_action = QAction("刷新", self)
-        refresh_action.triggered.connect(self.refresh_tasks)
+        refresh_action.setToolTip("重新读取全部任务，包括 task undo、task sync 等带回的修改")
+        refresh_action.triggered.connect(lambda: self.refresh_tasks(full_sync=True))
         self.menuBar().addAction(refresh_action)
+        hooks_action = QAction("安装钩子", self)
+        hooks_action.setToolTip("安装 Taskwarrior 钩子，终端中的修改会直接推送到本应用")
+        hooks_action.triggered.connect(self.install_hooks)
+        self.menuBar().addAction(hooks_action)
 
     def _setup_macos_shortcuts(self):
         if sys.platform != "darwin":
@@ -329,7 +208,6 @@ class MainWindow(QMainWindow):
 
         self.settings_button = QPushButton()
         self.settings_button.setObjectName("SettingsButton")
-        self.settings_button.setIcon(_icon("fa5s.cog", color="#6b7280"))
         self.settings_button.setToolTip("设置")
         self.settings_button.setFixedSize(32, 32)
         self.settings_button.clicked.connect(self.open_settings)
@@ -362,28 +240,57 @@ class MainWindow(QMainWindow):
         self.export_button = QPushButton("导出")
         self.export_button.setFixedHeight(35)
         self.export_button.setObjectName("ExportButton")
-        self.export_button.setIcon(_icon("fa5s.file-export", color="#1f5fd1"))
         self.export_button.clicked.connect(self.export_tasks)
         sort_row.addWidget(self.export_button)
+        self.import_button = QPushButton("导入")
+        self.import_button.setFixedHeight(35)
+        self.import_button.setObjectName("ImportButton")
+        self.import_button.clicked.connect(self.import_tasks)
+        sort_row.addWidget(self.import_button)
         layout.addLayout(sort_row)
 
-        self.task_list = QListWidget()
+        self.task_model = TaskListModel(self)
+        self.task_model.check_toggled.connect(self.on_item_check_changed)
+        self.task_list = QListView()
+        self.task_list.setObjectName("TaskList")
         palette = self.task_list.palette()
         # 列表选中颜色
         palette.setColor(QPalette.ColorRole.Highlight, QColor("#DBEAFE"))
         palette.setColor(QPalette.ColorRole.HighlightedText, QColor("#000000"))
         self.task_list.setPalette(palette)
         self.task_list.setSpacing(8)
-        self.task_list.itemSelectionChanged.connect(self.on_task_selected)
+        self.task_list.setUniformItemSizes(True)
+        self.task_list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.task_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.task_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.task_list.setItemDelegate(TaskItemDelegate(self.task_list))
+        self.task_list.setModel(self.task_model)
+        self.task_list.selectionModel().selectionChanged.connect(self.on_task_selected)
+        self.task_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.task_list.customContextMenuRequested.connect(self.show_task_menu)
         layout.addWidget(self.task_list, stretch=1)
+        scroll_bar = self.task_list.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.maybe_load_older_completed)
+        scroll_bar.rangeChanged.connect(self.maybe_load_older_completed)
+
+        self.history_label = QLabel()
+        self.history_label.setObjectName("HistoryLabel")
+        self.history_label.setStyleSheet("color: #6b7280; font-size: 12px;")
+        layout.addWidget(self.history_label)
 
         add_row = QHBoxLayout()
-        self.new_task_input = QLineEdit()
-        self.new_task_input.setPlaceholderText("添加任务")
+        self.new_task_input = QuickAddInput()
+        self.new_task_input.setPlaceholderText("添加任务（可粘贴多行，每行一个；支持 type: status: due: !!!）")
+        self.new_task_input.setToolTip(
+            "每行一个任务，Shift+Enter 换行。\n"
+            "type:类型  status:状态  due:2026-10-20 / today / +3d\n"
+            "!!! 高优先级  !! 中优先级  ! 低优先级"
+        )
+        self.new_task_input.submitted.connect(self.add_task)
         self.add_task_button = QPushButton("添加")
         self.add_task_button.clicked.connect(self.add_task)
         add_row.addWidget(self.new_task_input)
-        add_row.addWidget(self.add_task_button)
+        add_row.addWidget(self.add_task_button, alignment=Qt.AlignmentFlag.AlignTop)
         layout.addLayout(add_row)
 
         return panel
@@ -463,9 +370,6 @@ class MainWindow(QMainWindow):
         self.save_button = QPushButton("保存")
         self.complete_button = QPushButton("完成任务")
         self.delete_button = QPushButton("删除")
-        self.save_button.setIcon(_icon("fa5s.save", color="#ffffff"))
-        self.complete_button.setIcon(_icon("fa5s.check-circle", color="#ffffff"))
-        self.delete_button.setIcon(_icon("fa5s.trash", color="#ffffff"))
         button_row.addWidget(self.save_button)
         button_row.addWidget(self.complete_button)
         button_row.addWidget(self.delete_button)
@@ -475,6 +379,14 @@ class MainWindow(QMainWindow):
         self.complete_button.clicked.connect(self.complete_task)
         self.delete_button.clicked.connect(self.delete_task)
 
+        self.detail_desc.textEdited.connect(lambda: self.mark_detail_dirty("description"))
+        self.detail_status.currentIndexChanged.connect(lambda: self.mark_detail_dirty("xstatus"))
+        self.detail_type.currentIndexChanged.connect(lambda: self.mark_detail_dirty("xtype"))
+        self.detail_link.textEdited.connect(lambda: self.mark_detail_dirty("link"))
+        self.detail_note.textChanged.connect(lambda: self.mark_detail_dirty("note"))
+        self.detail_priority.currentIndexChanged.connect(lambda: self.mark_detail_dirty("priority"))
+        self.detail_due.dateChanged.connect(lambda: self.mark_detail_dirty("due"))
+
         self.detail_desc.editingFinished.connect(self.auto_save_task)
         self.detail_status.currentIndexChanged.connect(self.auto_save_task)
         self.detail_type.currentIndexChanged.connect(self.auto_save_task)
@@ -488,7 +400,7 @@ class MainWindow(QMainWindow):
 
     def set_filter(self, filter_name):
         self.current_filter = filter_name
-        self.refresh_tasks()
+        self.show_view()
 
     def on_filter_clicked(self, filter_name: str):
         if self.current_filter == filter_name and self.expanded_filter == filter_name:
@@ -497,57 +409,284 @@ class MainWindow(QMainWindow):
             self.expanded_filter = filter_name
         self.current_filter = filter_name
         self.current_type = None
-        self.refresh_tasks()
+        self.show_view()
 
     def on_type_clicked(self, filter_name: str, type_value: str):
         self.current_filter = filter_name
         self.current_type = type_value
         self.expanded_filter = filter_name
-        self.refresh_tasks()
+        self.show_view()
+
+    def refresh_tasks(self, full_sync: bool = False):
+        # A newer refresh supersedes any export that is still queued or running.
+        self.worker.cancel(self.refresh_job)
+        if self.data_watcher is not None:
+            # Anything written from here on is picked up by this sync.
+            self.data_watcher.mark_seen()
+        self.refresh_job = self.worker.submit(
+            self.service.fetch_tasks,
+            TaskFilter(),
+            full_sync,
+            on_success=self.on_tasks_loaded,
+            on_error=self.on_refresh_failed,
+        )
+
+    def on_refresh_failed(self, message: str):
+        # Paging waits for refresh_job to clear; a failed sync must not block it.
+        self.refresh_job = None
+        self.show_error(message)
+
+    def watch_data_location(self):
+        """(Re)start watching the data directory of the current backend, if it is on this machine."""
+        if self.data_watcher is not None:
+            self.data_watcher.deleteLater()
+            self.data_watcher = None
+        if not self.service.has_local_files():
+            return
+        self.worker.submit(self.service.data_location, on_success=self.start_watching_data)
+
+    def start_watching_data(self, location: str):
+        if self.data_watcher is not None or not os.path.isdir(location):
+            return
+        self.data_watcher = TaskDataWatcher(location, self)
+        self.data_watcher.changed.connect(self.on_data_changed)
+
+    def on_data_changed(self):
+        # Prefer what the hook spooled; fall back to a delta sync.
+        self.worker.submit(
+            self.service.read_hook_events,
+            on_success=self.on_hook_events,
+            on_error=lambda _message: self.refresh_tasks(),
+        )
+
+    def on_hook_events(self, changes):
+        if changes is None:
+            self.refresh_tasks()
+            return
+        # Local writes still in flight are newer than anything spooled.
+        changes = {task_uuid: task for task_uuid, task in changes.items() if task_uuid not in self.pending_writes}
+        if changes:
+            self.apply_local_changes(changes)
+
+    def install_hooks(self):
+        self.worker.submit(
+            self.service.install_hooks,
+            on_success=lambda location: QMessageBox.information(
+                self, "安装钩子", f"钩子已安装到：\n{location}"
+            ),
+            on_error=self.show_error,
+        )
 
-    def refresh_tasks(self):
+    def restore_snapshot(self):
+        """Show the task list saved on the last exit until the first sync lands."""
+        if self.snapshot is None:
+            return
+        loaded = self.snapshot.load()
+        if loaded is None:
+            return
+        tasks, state = loaded
+        if state.get("filter") in VIEW_STATES:
+            self.current_filter = state["filter"]
+            self.current_type = state.get("type")
+            self.expanded_filter = state.get("expanded")
+        sort_index = self.sort_combo.findData(state.get("sort"))
+        if sort_index >= 0:
+            self.sort_combo.blockSignals(True)
+            self.sort_combo.setCurrentIndex(sort_index)
+            self.sort_combo.blockSignals(False)
+        self.store.replace(tasks)
+        self.show_view()
+        self.select_task(state.get("selected"))
+
+    def save_snapshot(self):
+        if self.snapshot is None:
+            return
+        state = {
+            "filter": self.current_filter,
+            "type": self.current_type,
+            "expanded": self.expanded_filter,
+            "sort": self.sort_combo.currentData(),
+            "selected": self.selected_task_uuid(),
+        }
         try:
-            tasks = self.service.fetch_tasks(self.current_filter)
-            self.update_type_submenus(tasks)
-            tasks = self.apply_type_filter(tasks)
-            tasks = self.sort_tasks(tasks)
-            self.tasks_by_uuid = {task.uuid: task for task in tasks if task.uuid}
-            selected_uuid = None
-            current_item = self.task_list.currentItem()
-            if current_item is not None:
-                selected_uuid = current_item.data(Qt.ItemDataRole.UserRole)
-            self.populate_task_list(tasks)
-            if selected_uuid:
-                self._restore_selection(selected_uuid)
-            if self.current_task_uuid is not None:
-                task = self.tasks_by_uuid.get(self.current_task_uuid)
-                if task:
-                    self.update_complete_button(task)
-            if self.task_list.currentItem() is None:
-                self.clear_details()
+            self.snapshot.save(self.store.tasks(), state)
+        except OSError:
+            pass
+
+    def select_task(self, task_uuid: str | None):
+        if not task_uuid:
+            return
+        row = self.task_model.row_for_uuid(task_uuid)
+        if row < 0:
+            return
+        index = self.task_model.index(row)
+        self.task_list.setCurrentIndex(index)
+        self.task_list.scrollTo(index)
+
+    def maybe_load_older_completed(self, *_args):
+        """Fetch the next window of completed tasks once the list nears its end."""
+        if self.current_filter not in ("all", "completed"):
+            return
+        if self.refresh_job is not None or self.history_job is not None:
+            return
+        if not self.service.has_older_completed():
+            return
+        scroll_bar = self.task_list.verticalScrollBar()
+        if scroll_bar.value() < scroll_bar.maximum() - scroll_bar.pageStep():
+            return
+        self.history_job = self.worker.submit(
+            self.service.load_older_completed,
+            on_success=self.on_older_completed_loaded,
+            on_error=self.on_older_completed_failed,
+        )
+
+    def on_older_completed_loaded(self, changes):
+        self.history_job = None
+        changes = {task_uuid: task for task_uuid, task in changes.items() if task_uuid not in self.pending_writes}
+        if changes:
+            # Growing the list re-checks the scroll position and may load the next window.
+            self.apply_local_changes(changes)
+        else:
+            self.update_history_label()
+
+    def on_older_completed_failed(self, message: str):
+        self.history_job = None
+        self.show_error(message)
+
+    def update_history_label(self):
+        if self.current_filter not in ("all", "completed"):
+            self.history_label.setVisible(False)
+            return
+        self.history_label.setVisible(True)
+        if not self.service.has_older_completed():
+            self.history_label.setText("已加载全部已完成任务")
+            return
+        floor = parse_timestamp(self.service.completed_floor())
+        since = time.strftime("%Y-%m-%d", time.localtime(floor)) if floor is not None else ""
+        self.history_label.setText(f"已加载 {since} 之后完成的任务，滚动到底部加载更早的记录")
+
+    def current_task_filter(self) -> TaskFilter:
+        return TaskFilter(state=self.current_filter, xtype=self.current_type)
+
+    def export_task_filter(self) -> TaskFilter:
+        # The view applies the search through the store's index; exports filter themselves.
+        return TaskFilter(state=self.current_filter, xtype=self.current_type, search=self.search_input.text())
+
+    def on_tasks_loaded(self, tasks):
+        self.refresh_job = None
+        try:
+            if self.pending_writes:
+                # This export may predate writes still in flight; keep showing them.
+                tasks = [
+                    self.pending_writes[task.uuid][1] if task.uuid in self.pending_writes else task
+                    for task in tasks
+                ]
+                tasks = [task for task in tasks if task is not None]
+            self.store.replace(tasks)
+            if self.search_index_stale:
+                self.build_search_index()
+            else:
+                self.search_index.update(self.store.tasks())
+            self.show_view()
+            self.tasks_loaded.emit()
         except Exception as exc:
             self.show_error(str(exc))
 
-    def populate_task_list(self, tasks):
-        self.is_populating = True
-        self.task_list.clear()
-        self.item_widgets = {}
-        for task in tasks:
-            if not task.uuid:
-                continue
-            item = QListWidgetItem()
-            item.setData(Qt.ItemDataRole.UserRole, task.uuid)
-            widget = TaskListItemWidget(task, self.on_item_check_changed)
-            widget.set_checked(task.task_state == "completed")
-            widget.bind_item(item, self.task_list)
-            self.item_widgets[task.uuid] = widget
-            self.task_list.addItem(item)
-            self.task_list.setItemWidget(item, widget)
-        self.is_populating = False
-        self.update_selection_styles()
+    def build_search_index(self):
+        if self.search_index_job is not None:
+            return
+        self.search_index_job = self.worker.submit(
+            build_index,
+            self.store.tasks(),
+            on_success=self.on_search_index_built,
+            on_error=self.show_error,
+        )
+
+    def on_search_index_built(self, index: SearchIndex):
+        self.search_index_job = None
+        if not self.search_index_stale:
+            return
+        self.search_index = index
+        # Catch up with anything changed locally while it was being built.
+        self.search_index.update(self.store.tasks())
+        self.search_index_stale = False
+
+    def show_view(self):
+        self.update_type_submenus(self.store.type_counts(self.current_filter))
+        self.view_tasks = self.sort_tasks(self.store.view(self.current_task_filter()))
+        self.view_rows = None
+        self.apply_search_filter()
+        self.update_history_label()
+
+    def apply_search_filter(self):
+        query = self.search_input.text()
+        if query.strip() and self.search_index_stale:
+            self.worker.cancel(self.search_index_job)
+            self.search_index_job = None
+            self.search_index.update(self.store.tasks())
+            self.search_index_stale = False
+        matches = self.search_index.search(query)
+        if matches is None:
+            tasks = self.view_tasks
+        else:
+            tasks = [task for task in self.view_tasks if task.uuid in matches]
+        self.reconcile_task_list(tasks)
+        self.refresh_details()
+
+    def patch_view(self, previous: dict[str, TaskItem | None], changes: dict[str, TaskItem | None]) -> bool:
+        """Update the changed rows in place when none of them enters, leaves or moves in the list.
+
+        Returns ``False``, having changed nothing, when ``show_view`` must re-sort instead.
+        """
+        query = self.search_input.text()
+        if query.strip() and self.search_index_stale:
+            return False
+        matches = self.search_index.search(query)
+        task_filter = self.current_task_filter()
+        if self.view_rows is None:
+            self.view_rows = {task.uuid: row for row, task in enumerate(self.view_tasks)}
+        for task_uuid, task in changes.items():
+            in_view = task is not None and task_filter.matches(task)
+            if in_view != (task_uuid in self.view_rows):
+                return False
+            listed = in_view and (matches is None or task_uuid in matches)
+            if listed != (self.task_model.row_for_uuid(task_uuid) >= 0):
+                return False
+            old = previous.get(task_uuid)
+            if in_view and (old is None or self.sort_key(old) != self.sort_key(task)):
+                return False
+        self.update_type_submenus(self.store.type_counts(self.current_filter))
+        for task_uuid, task in changes.items():
+            if task is not None and task_uuid in self.view_rows:
+                self.view_tasks[self.view_rows[task_uuid]] = task
+                self.task_model.update_task(task)
+        self.refresh_details()
+        return True
+
+    def refresh_details(self):
+        selected_uuid = self.selected_task_uuid()
+        if selected_uuid is None:
+            self.clear_details()
+        elif self.store.get(selected_uuid) != self.detail_task:
+            self.on_task_selected()
+
+    def reconcile_task_list(self, tasks):
+        self.task_model.set_tasks(tasks)
+
+    def selected_task_uuid(self) -> str | None:
+        """The task shown in the detail panel; ``None`` unless exactly one is selected."""
+        indexes = self.task_list.selectionModel().selectedIndexes()
+        if len(indexes) != 1:
+            return None
+        return indexes[0].data(Qt.ItemDataRole.UserRole)
+
+    def selected_tasks(self) -> list[TaskItem]:
+        indexes = sorted(self.task_list.selectionModel().selectedIndexes(), key=lambda index: index.row())
+        tasks = [self.store.get(index.data(Qt.ItemDataRole.UserRole)) for index in indexes]
+        return [task for task in tasks if task is not None]
 
     def on_sort_changed(self):
-        self.refresh_tasks()
+        self.show_view()
 
     def sort_tasks(self, tasks):
         if not getattr(self, "sort_combo", None):
@@ -565,6 +704,17 @@ class MainWindow(QMainWindow):
         indexed.sort(key=lambda pair: (self._priority_rank(pair[1]), pair[0]))
         return [task for _, task in indexed]
 
+    def sort_key(self, task: TaskItem) -> tuple:
+        """What ``sort_tasks`` orders by, besides the store order it keeps stable."""
+        mode = self.sort_combo.currentData()
+        if mode == "priority":
+            rank = self._priority_rank(task)
+        elif mode == "due":
+            rank = self._due_rank(task)
+        else:
+            rank = 0
+        return (rank, self.current_filter == "all" and task.task_state == "completed")
+
     @staticmethod
     def _order_by_completion(tasks):
         indexed = list(enumerate(tasks))
@@ -578,33 +728,23 @@ class MainWindow(QMainWindow):
 
     @staticmethod
     def _due_rank(task: TaskItem) -> tuple[int, int]:
-        parsed = parse_due_date(task.due)
-        if not parsed:
+        if task.due_day is None:
             return (1, 0)
-        return (0, parsed.toJulianDay())
-
-    def apply_search_filter(self):
-        text = self.search_input.text().strip().lower()
-        for i in range(self.task_list.count()):
-            item = self.task_list.item(i)
-            widget = self.task_list.itemWidget(item)
-            if not widget:
-                continue
-            search_target = f"{widget.title_label.text()} {widget.meta_label.text()}".lower()
-            item.setHidden(text not in search_target)
+        return (0, task.due_day)
 
     def on_task_selected(self):
-        selected = self.task_list.currentItem()
-        if not selected:
+        task_uuid = self.selected_task_uuid()
+        if not task_uuid:
             self.clear_details()
             return
-        task_uuid = selected.data(Qt.ItemDataRole.UserRole)
         self.current_task_uuid = task_uuid
-        task = self.tasks_by_uuid.get(task_uuid)
+        task = self.store.get(task_uuid)
         if not task:
             self.clear_details()
             return
         self.detail_panel.setVisible(True)
+        self.detail_task = task
+        self.dirty_fields.clear()
         self.is_loading_details = True
         self.detail_desc.setText(task.description)
         self.detail_status.setCurrentText(task.xstatus)
@@ -628,44 +768,205 @@ class MainWindow(QMainWindow):
         else:
             index = self.detail_priority.findData("L")
             self.detail_priority.setCurrentIndex(index)
-        parsed_due = parse_due_date(task.due)
+        parsed_due = to_qdate(task.due_day)
         if parsed_due:
             self.detail_due.setDate(parsed_due)
         else:
             self.detail_due.setDate(QDate.currentDate())
         self.update_complete_button(task)
-        self.update_selection_styles()
         self.is_loading_details = False
 
     def add_task(self):
-        description = self.new_task_input.text().strip()
-        if not description:
-            return
+        text = self.new_task_input.text()
         try:
-            self.service.add_task(description, "L")
-            self.new_task_input.clear()
-            self.refresh_tasks()
-        except Exception as exc:
+            records = parse_quick_add(text)
+        except ValueError as exc:
             self.show_error(str(exc))
+            return
+        if not records:
+            return
+        self.new_task_input.clear()
+
+        def on_error(message: str):
+            # Give the lines back rather than losing them.
+            if not self.new_task_input.text().strip():
+                self.new_task_input.setPlainText(text)
+            self.show_error(message)
+
+        self.worker.submit(
+            self.service.add_tasks,
+            records,
+            on_success=self.on_tasks_added,
+            on_error=on_error,
+        )
+
+    def on_tasks_added(self, changes: dict[str, TaskItem]):
+        changes = {task_uuid: task for task_uuid, task in changes.items() if task_uuid not in self.pending_writes}
+        if changes:
+            self.apply_local_changes(changes)
+
+    def run_optimistic_write(self, previous: TaskItem, updated: TaskItem | None, kind: str, changes=None):
+        """Show ``updated`` (``None`` = deleted) at once and queue the write behind it.
+
+        ``kind`` and ``changes`` describe the write for ``TaskService.queue_write``.
+        The local change is rolled back if Taskwarrior rejects the write. No
+        export follows a successful write; the next delta sync confirms it.
+        """
+        self.run_optimistic_bulk([(previous, updated)], kind, changes)
+
+    def run_optimistic_bulk(self, changes: list[tuple[TaskItem, TaskItem | None]], kind: str, write_changes=None):
+        # Queued edits to this or any other task must reach Taskwarrior first.
+        self.flush_pending_edits()
+        token = object()
+        for previous, updated in changes:
+            self.pending_writes[previous.uuid] = (token, updated)
+        self.apply_local_changes({previous.uuid: updated for previous, updated in changes})
+        self.commit_write(token, {previous.uuid: previous for previous, _ in changes}, kind, write_changes)
+
+    def commit_write(self, token: object, previous: dict[str, TaskItem], kind: str, changes=None):
+        operation = self.service.queue_write(kind, list(previous), changes)
+        self.write_callbacks[operation] = (token, previous)
+        if self.write_job is None:
+            self.submit_write_flush()
+
+    def submit_write_flush(self):
+        # Writes queued while this flush runs wait for the next one and may merge there.
+        self.write_job = self.worker.submit(
+            self.service.flush_writes,
+            on_success=self.on_writes_flushed,
+            on_error=self.on_write_flush_failed,
+        )
+
+    def on_writes_flushed(self, results):
+        self.write_job = None
+        errors = []
+        refresh = False
+        for result in results:
+            token, previous = self.write_callbacks.pop(result.operation, (None, {}))
+            # Only settle (or undo) what no later write has replaced.
+            owned = [task_uuid for task_uuid in previous if self.pending_writes.get(task_uuid, (None,))[0] is token]
+            for task_uuid in owned:
+                del self.pending_writes[task_uuid]
+            if result.ok:
+                continue
+            if owned:
+                self.apply_local_changes({task_uuid: previous[task_uuid] for task_uuid in owned})
+            # Earlier chunks of a bulk command may have gone through.
+            refresh = refresh or len(previous) > 1
+            if result.error not in errors:
+                errors.append(result.error)
+        if self.service.has_queued_writes():
+            self.submit_write_flush()
+        if refresh:
+            self.refresh_tasks()
+        if errors:
+            failed = sum(1 for result in results if not result.ok)
+            if failed > 1:
+                errors.insert(0, f"{failed} 项修改未能保存：")
+            self.show_error("\n\n".join(errors))
+
+    def on_write_flush_failed(self, message: str):
+        self.write_job = None
+        self.write_callbacks.clear()
+        self.pending_writes.clear()
+        self.refresh_tasks()
+        self.show_error(message)
+
+    def apply_local_change(self, task_uuid: str, task: TaskItem | None):
+        self.apply_local_changes({task_uuid: task})
+
+    def apply_local_changes(self, changes: dict[str, TaskItem | None]):
+        previous = {task_uuid: self.store.get(task_uuid) for task_uuid in changes}
+        self.store.apply(changes)
+        if not self.search_index_stale:
+            for task_uuid, task in changes.items():
+                if task is None:
+                    self.search_index.remove(task_uuid)
+                else:
+                    self.search_index.add(task)
+        # Edits that leave every row in place skip re-sorting the whole list.
+        if not self.patch_view(previous, changes):
+            self.show_view()
 
     def save_task(self):
-        selected = self.task_list.currentItem()
-        if not selected:
+        self.queue_detail_changes()
+        self.flush_pending_edits()
+
+    def mark_detail_dirty(self, field: str):
+        if self.is_loading_details or self.detail_task is None:
             return
-        task_uuid = selected.data(Qt.ItemDataRole.UserRole)
-        description = self.detail_desc.text().strip()
-        note = self.detail_note.toPlainText().strip()
-        xstatus = self.detail_status.currentText().strip()
-        xtype = self.detail_type.currentData() or ""
-        link = self.detail_link.text().strip()
-        priority = self.detail_priority.currentData() or "L"
-        due = self.detail_due.date().toString("yyyy-MM-dd")
+        self.dirty_fields.add(field)
 
-        try:
-            self.service.update_task(task_uuid, description, note, xtype, xstatus, link, priority, due)
-            self.refresh_tasks()
-        except Exception as exc:
-            self.show_error(str(exc))
+    def queue_detail_changes(self):
+        if self.current_task_uuid is None:
+            return
+        task = self.store.get(self.current_task_uuid)
+        if not task:
+            return
+        changes = {}
+        for field in self.dirty_fields:
+            value = self.detail_field_value(field)
+            if value != self.task_field_value(task, field):
+                changes[field] = value
+        self.dirty_fields.clear()
+        if changes:
+            self.edit_task(task, changes)
+
+    def edit_task(self, task: TaskItem, changes: dict[str, str]):
+        """Show ``changes`` at once and fold them into the task's queued modify."""
+        base, queued = self.pending_edits.get(task.uuid, (task, {}))
+        queued.update(changes)
+        self.pending_edits[task.uuid] = (base, queued)
+        values = dict(changes)
+        if values.get("due"):
+            values["due"] = build_due_value(values["due"])
+        updated = task.replace(**values)
+        # The panel already shows these values; don't reload it under the cursor.
+        self.detail_task = updated
+        self.pending_writes[task.uuid] = (object(), updated)
+        self.apply_local_change(task.uuid, updated)
+        self.edit_timer.start()
+
+    def flush_pending_edits(self):
+        self.edit_timer.stop()
+        edits, self.pending_edits = self.pending_edits, {}
+        for task_uuid, (base, queued) in edits.items():
+            changes = {
+                field: value
+                for field, value in queued.items()
+                if value != self.task_field_value(base, field)
+            }
+            token = self.pending_writes.get(task_uuid, (None,))[0]
+            if not changes:
+                # Edited and changed back before the write went out.
+                self.pending_writes.pop(task_uuid, None)
+                continue
+            self.commit_write(token, {task_uuid: base}, "modify", changes)
+
+    def detail_field_value(self, field: str) -> str:
+        if field == "description":
+            return self.detail_desc.text().strip()
+        if field == "note":
+            return self.detail_note.toPlainText().strip()
+        if field == "xstatus":
+            return self.detail_status.currentData() or ""
+        if field == "xtype":
+            return self.detail_type.currentData() or ""
+        if field == "link":
+            return self.detail_link.text().strip()
+        if field == "priority":
+            return self.detail_priority.currentData() or "L"
+        return self.detail_due.date().toString("yyyy-MM-dd")
+
+    @staticmethod
+    def task_field_value(task: TaskItem, field: str) -> str:
+        if field == "xtype":
+            return normalize_task_type(task.xtype)
+        if field == "priority":
+            return task.priority or "L"
+        if field == "due":
+            return date.fromordinal(task.due_day).isoformat() if task.due_day is not None else ""
+        return getattr(task, field)
 
     def auto_save_task(self):
         if self.is_loading_details:
@@ -674,7 +975,7 @@ class MainWindow(QMainWindow):
             return
         if self.current_task_uuid is None:
             return
-        self.save_task()
+        self.queue_detail_changes()
 
     def eventFilter(self, obj, event):
         if obj is self.detail_note and event.type() == event.Type.FocusOut:
@@ -682,27 +983,82 @@ class MainWindow(QMainWindow):
         return super().eventFilter(obj, event)
 
     def complete_task(self):
-        selected = self.task_list.currentItem()
-        if not selected:
+        task_uuid = self.selected_task_uuid()
+        if not task_uuid:
             return
-        task_uuid = selected.data(Qt.ItemDataRole.UserRole)
-        task = self.tasks_by_uuid.get(task_uuid)
+        task = self.store.get(task_uuid)
         if not task:
             return
-        try:
-            if task.task_state == "completed":
-                self.service.reopen_task(task_uuid)
-            else:
-                self.service.complete_task(task_uuid)
-            self.refresh_tasks()
-        except Exception as exc:
-            self.show_error(str(exc))
+        self.set_task_completed(task, task.task_state != "completed")
+
+    def set_task_completed(self, task: TaskItem, completed: bool):
+        if completed:
+            updated = task.replace(task_state="completed", end=format_timestamp(int(time.time())))
+            self.run_optimistic_write(task, updated, "complete")
+        else:
+            updated = task.replace(task_state="pending", end="")
+            self.run_optimistic_write(task, updated, "reopen")
+
+    def set_tasks_completed(self, tasks: list[TaskItem], completed: bool):
+        tasks = [task for task in tasks if (task.task_state == "completed") != completed]
+        if not tasks:
+            return
+        if completed:
+            end = format_timestamp(int(time.time()))
+            changes = [(task, task.replace(task_state="completed", end=end)) for task in tasks]
+            self.run_optimistic_bulk(changes, "complete")
+        else:
+            changes = [(task, task.replace(task_state="pending", end="")) for task in tasks]
+            self.run_optimistic_bulk(changes, "reopen")
+
+    def set_tasks_field(self, tasks: list[TaskItem], field: str, value: str):
+        tasks = [task for task in tasks if self.task_field_value(task, field) != value]
+        if not tasks:
+            return
+        changes = [(task, task.replace(**{field: value})) for task in tasks]
+        self.run_optimistic_bulk(changes, "modify", {field: value})
+
+    def delete_tasks(self, tasks: list[TaskItem]):
+        if not tasks:
+            return
+        confirm = QMessageBox.question(
+            self,
+            "删除任务",
+            f"确定删除选中的 {len(tasks)} 个任务？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+        changes = [(task, None) for task in tasks]
+        self.run_optimistic_bulk(changes, "delete")
+
+    def show_task_menu(self, pos):
+        tasks = self.selected_tasks()
+        if not tasks:
+            return
+        menu = QMenu(self)
+        if any(task.task_state != "completed" for task in tasks):
+            menu.addAction("完成", lambda: self.set_tasks_completed(tasks, True))
+        if any(task.task_state == "completed" for task in tasks):
+            menu.addAction("撤销完成", lambda: self.set_tasks_completed(tasks, False))
+        type_menu = menu.addMenu("设置类型")
+        for label, value in self._type_entries():
+            type_menu.addAction(label, lambda value=value: self.set_tasks_field(tasks, "xtype", value))
+        status_menu = menu.addMenu("设置状态")
+        status_menu.addAction(NONE_STATUS_LABEL, lambda: self.set_tasks_field(tasks, "xstatus", ""))
+        for name in self.status_options:
+            cleaned = name.strip()
+            if not cleaned or cleaned == NONE_STATUS_LABEL:
+                continue
+            status_menu.addAction(cleaned, lambda value=cleaned: self.set_tasks_field(tasks, "xstatus", value))
+        menu.addSeparator()
+        menu.addAction(f"删除 {len(tasks)} 个任务" if len(tasks) > 1 else "删除", lambda: self.delete_tasks(tasks))
+        menu.exec(self.task_list.viewport().mapToGlobal(pos))
 
     def delete_task(self):
-        selected = self.task_list.currentItem()
-        if not selected:
+        task_uuid = self.selected_task_uuid()
+        if not task_uuid:
             return
-        task_uuid = selected.data(Qt.ItemDataRole.UserRole)
         confirm = QMessageBox.question(
             self,
             "删除任务",
@@ -711,14 +1067,15 @@ class MainWindow(QMainWindow):
         )
         if confirm != QMessageBox.StandardButton.Yes:
             return
-        try:
-            self.service.delete_task(task_uuid)
-            self.refresh_tasks()
-        except Exception as exc:
-            self.show_error(str(exc))
+        task = self.store.get(task_uuid)
+        if not task:
+            return
+        self.run_optimistic_write(task, None, "delete")
 
     def clear_details(self):
         self.current_task_uuid = None
+        self.detail_task = None
+        self.dirty_fields.clear()
         self.detail_desc.clear()
         self.detail_status.setCurrentIndex(0)
         type_index = self.detail_type.findData("")
@@ -728,13 +1085,18 @@ class MainWindow(QMainWindow):
         self.detail_note.clear()
         self.detail_priority.setCurrentIndex(0)
         self.detail_due.setDate(QDate.currentDate())
-        self.complete_button.setText("完成")
-        self.update_selection_styles()
+        self.update_complete_button(None)
         self.detail_panel.setVisible(False)
 
     def show_error(self, message):
         QMessageBox.critical(self, "错误", message)
 
+    def on_worker_busy_changed(self, busy: bool):
+        if busy:
+            self.statusBar().showMessage("正在同步 Taskwarrior…")
+        else:
+            self.statusBar().clearMessage()
+
     def closeEvent(self, event):
         confirm = QMessageBox.question(
             self,
@@ -743,143 +1105,236 @@ class MainWindow(QMainWindow):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
         )
         if confirm == QMessageBox.StandardButton.Yes:
+            self.flush_pending_edits()
+            self.worker.cancel(self.refresh_job)
+            self.worker.cancel(self.search_index_job)
+            self.worker.cancel(self.history_job)
+            self.worker.wait()
+            # A flush that was running reports through queued signals; handle
+            # its result (errors, rollbacks, a follow-up flush) before going on.
+            while self.write_job is not None:
+                QCoreApplication.processEvents()
+                self.worker.wait()
+            self.worker.cancel(self.refresh_job)
+            self.worker.wait()
+            # Writes queued behind a running flush have no job yet; don't drop them.
+            if self.service.has_queued_writes() and not self.confirm_close_after_flush():
+                event.ignore()
+                return
+            self.service.close()
+            self.settings_service.remove_listener(self.on_setting_changed)
+            self.save_snapshot()
             event.accept()
         else:
             event.ignore()
 
+    def confirm_close_after_flush(self) -> bool:
+        """Flush the queued writes; if any fail, ask before quitting without them."""
+        results = self.service.flush_writes()
+        errors = list(dict.fromkeys(result.error for result in results if not result.ok))
+        if not errors:
+            return True
+        confirm = QMessageBox.question(
+            self,
+            "退出应用",
+            f"{sum(1 for result in results if not result.ok)} 项修改未能保存：\n\n"
+            + "\n\n".join(errors)
+            + "\n\n仍要退出吗？这些修改将会丢失。",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No,
+        )
+        if confirm == QMessageBox.StandardButton.Yes:
+            return True
+        # Staying: roll the failed changes back as a normal flush would.
+        self.on_writes_flushed(results)
+        return False
+
     def on_item_check_changed(self, task_uuid: str | None, checked: bool):
-        if self.is_populating:
-            return
         if not task_uuid:
             return
-        task = self.tasks_by_uuid.get(task_uuid)
+        task = self.store.get(task_uuid)
         if not task:
             return
-        try:
-            if checked and task.task_state != "completed":
-                self.service.complete_task(task_uuid)
-            elif not checked and task.task_state == "completed":
-                self.service.reopen_task(task_uuid)
-            else:
-                return
-            self.refresh_tasks()
-        except Exception as exc:
-            self.show_error(str(exc))
-
-    def update_complete_button(self, task: TaskItem):
-        if task.task_state == "completed":
-            self.complete_button.setText("撤销完成")
-            self.complete_button.setIcon(_icon("fa5s.undo", color="#ffffff"))
-        else:
-            self.complete_button.setText("完成")
-            self.complete_button.setIcon(_icon("fa5s.check-circle", color="#ffffff"))
-
-    def update_selection_styles(self):
-        selected_item = self.task_list.currentItem()
-        selected_id = None
-        if selected_item is not None:
-            selected_id = selected_item.data(Qt.ItemDataRole.UserRole)
-        for task_uuid, widget in self.item_widgets.items():
-            widget.set_selected(task_uuid == selected_id)
+        if checked != (task.task_state == "completed"):
+            self.set_task_completed(task, checked)
+
+    def update_complete_button(self, task: TaskItem | None):
+        completed = task is not None and task.task_state == "completed"
+        self.complete_button.setText("撤销完成" if completed else "完成")
+        if self.icons_ready:
+            self.complete_button.setIcon(icon("fa5s.undo" if completed else "fa5s.check-circle", "#ffffff"))
+
+    def load_icons(self):
+        self.icons_ready = True
+        self.settings_button.setIcon(icon("fa5s.cog", "#6b7280"))
+        self.export_button.setIcon(icon("fa5s.file-export", "#1f5fd1"))
+        self.import_button.setIcon(icon("fa5s.file-import", "#1f5fd1"))
+        self.save_button.setIcon(icon("fa5s.save", "#ffffff"))
+        self.delete_button.setIcon(icon("fa5s.trash", "#ffffff"))
+        self.update_complete_button(self.detail_task)
+        for label, icon_name in self.field_icons:
+            label.setPixmap(pixmap(icon_name, "#AACFFF", 14))
 
     def clear_selection(self):
         self.task_list.clearSelection()
         self.clear_details()
 
     def export_tasks(self):
-        tasks = []
-        for i in range(self.task_list.count()):
-            item = self.task_list.item(i)
-            if item.isHidden():
-                continue
-            task_uuid = item.data(Qt.ItemDataRole.UserRole)
-            task = self.tasks_by_uuid.get(task_uuid)
-            if task:
-                tasks.append(task)
-        if not tasks:
-            QMessageBox.information(self, "导出", "当前列表没有可导出的任务。")
-            return
-        file_path, _ = QFileDialog.getSaveFileName(
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             self,
             "导出任务",
             "tasks.xlsx",
-            "Excel Workbook (*.xlsx)",
+            ";;".join(EXPORT_FORMATS.values()),
         )
         if not file_path:
             return
-        if not file_path.lower().endswith(".xlsx"):
-            file_path += ".xlsx"
-        try:
-            from openpyxl import Workbook
-        except ImportError:
-            self.show_error("缺少 openpyxl 依赖，请先安装：pip install openpyxl")
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension not in EXPORT_FORMATS:
+            for candidate, label in EXPORT_FORMATS.items():
+                if label == selected_filter:
+                    extension = candidate
+                    break
+            else:
+                extension = ".xlsx"
+            file_path += extension
+
+        # The total is only known once Taskwarrior has answered; spin until then.
+        dialog = QProgressDialog("正在导出任务…", "取消", 0, 0, self)
+        dialog.setWindowTitle("导出")
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(300)
+
+        def on_progress(done: int, total: int):
+            dialog.setMaximum(total)
+            dialog.setValue(min(done, total))
+
+        def on_success(count: int):
+            dialog.reset()
+            QMessageBox.information(self, "导出", f"导出成功，共 {count} 条。")
+
+        def on_error(message: str):
+            dialog.reset()
+            self.show_error(message)
+
+        # Exported from Taskwarrior, so completed tasks outside the loaded window are included.
+        job = self.worker.submit(
+            self.service.export_to_file,
+            self.export_task_filter(),
+            file_path,
+            on_success=on_success,
+            on_error=on_error,
+            on_progress=on_progress,
+        )
+        dialog.canceled.connect(lambda: self.worker.cancel(job))
+
+    def import_tasks(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "导入任务",
+            "",
+            ";;".join([f"任务文件 ({' '.join('*' + ext for ext in IMPORT_FORMATS)})"] + list(IMPORT_FORMATS.values())),
+        )
+        if not file_path:
             return
-        try:
-            workbook = Workbook()
-            sheet = workbook.active
-            sheet.title = "Tasks"
-            headers = [
-                "任务",
-                "类型",
-                "状态",
-                "自定义状态",
-                "优先级",
-                "截止日期",
-                "完成时间",
-                "链接",
-                "备注",
-                "项目",
-                "UUID",
-            ]
-            sheet.append(headers)
-            for task in tasks:
-                priority_label = PRIORITY_LABELS.get((task.priority or "").upper(), task.priority or "")
-                priority_text = ""
-                if task.priority:
-                    priority_text = f"{task.priority} · {priority_label}" if priority_label else task.priority
-                due_value = ""
-                parsed_due = parse_due_date(task.due)
-                if parsed_due:
-                    due_value = parsed_due.toString("yyyy-MM-dd")
-                completed_value = self._format_completed_value(task.end)
-                sheet.append(
-                    [
-                        task.description,
-                        normalize_task_type(task.xtype),
-                        task.task_state,
-                        task.xstatus,
-                        priority_text,
-                        due_value,
-                        completed_value,
-                        task.link,
-                        task.note,
-                        task.project,
-                        task.uuid,
-                    ]
-                )
-            workbook.save(file_path)
-            QMessageBox.information(self, "导出", "导出成功。")
-        except Exception as exc:
-            self.show_error(str(exc))
+        dialog = QProgressDialog("正在读取文件…", "取消", 0, 0, self)
+        dialog.setWindowTitle("导入")
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(300)
+
+        def on_progress(done: int, total: int):
+            # Only xlsx knows its row count up front; otherwise stay indeterminate.
+            if total:
+                dialog.setMaximum(total)
+                dialog.setValue(min(done, total))
+            dialog.setLabelText(f"正在读取文件…已读取 {done} 行")
+
+        def on_success(plan: ImportPlan):
+            dialog.reset()
+            self.confirm_import(plan)
+
+        def on_error(message: str):
+            dialog.reset()
+            self.show_error(message)
+
+        job = self.worker.submit(
+            self.service.plan_import,
+            file_path,
+            on_success=on_success,
+            on_error=on_error,
+            on_progress=on_progress,
+        )
+        dialog.canceled.connect(lambda: self.worker.cancel(job))
+
+    def confirm_import(self, plan: ImportPlan):
+        """Dry-run preview: show what the file would change before writing anything."""
+        if not plan.records:
+            message = "文件中没有可导入的任务。"
+            if plan.issues:
+                message += "\n\n" + self._format_import_issues(plan)
+            QMessageBox.information(self, "导入", message)
+            return
+        summary = f"共读取 {plan.rows} 行：将新增 {plan.additions} 个任务，按 UUID 更新 {plan.updates} 个任务。"
+        if plan.skipped:
+            summary += f"\n{plan.skipped} 行数据有误，将被跳过。"
+        preview = ["预览（前 20 条）："]
+        for record in plan.records[:20]:
+            fields = [record.get("xtype") or NONE_TYPE_LABEL, record.get("xstatus") or NONE_STATUS_LABEL]
+            preview.append(f"· {record['description']}（{' / '.join(fields)}）")
+        if plan.issues:
+            preview += ["", self._format_import_issues(plan)]
+        box = QMessageBox(self)
+        box.setWindowTitle("导入预览")
+        box.setIcon(QMessageBox.Icon.Question)
+        box.setText(summary)
+        box.setInformativeText("确定导入吗？")
+        box.setDetailedText("\n".join(preview))
+        box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if box.exec() != QMessageBox.StandardButton.Yes:
+            return
+        self.flush_pending_edits()
+        dialog = QProgressDialog(f"正在导入 {len(plan.records)} 个任务…", None, 0, 0, self)
+        dialog.setWindowTitle("导入")
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(0)
+        dialog.show()
+
+        def on_success(count: int):
+            dialog.reset()
+            self.refresh_tasks()
+            QMessageBox.information(self, "导入", f"导入成功，共 {count} 条。")
+
+        def on_error(message: str):
+            dialog.reset()
+            self.show_error(message)
+
+        self.worker.submit(
+            self.service.import_records,
+            plan.records,
+            plan.update_uuids,
+            on_success=on_success,
+            on_error=on_error,
+        )
+
+    @staticmethod
+    def _format_import_issues(plan: ImportPlan) -> str:
+        lines = ["以下行未通过校验："]
+        lines += [f"第 {row} 行：{message}" for row, message in plan.issues]
+        if plan.skipped > len(plan.issues):
+            lines.append(f"……另有 {plan.skipped - len(plan.issues)} 行")
+        return "\n".join(lines)
 
     def _add_field(self, layout, label_text, icon_name, widget):
         header_row = QHBoxLayout()
-        icon = QLabel()
-        icon.setPixmap(_icon(icon_name, color="#AACFFF").pixmap(14, 14))
-        header_row.addWidget(icon)
+        icon_label = QLabel()
+        icon_label.setFixedSize(14, 14)
+        self.field_icons.append((icon_label, icon_name))
+        header_row.addWidget(icon_label)
         header_row.addWidget(QLabel(label_text))
         header_row.addStretch(1)
         layout.addLayout(header_row)
         layout.addWidget(widget)
 
-    def _restore_selection(self, task_uuid: str):
-        for i in range(self.task_list.count()):
-            item = self.task_list.item(i)
-            if item.data(Qt.ItemDataRole.UserRole) == task_uuid:
-                self.task_list.setCurrentItem(item)
-                return
-
-    def update_type_submenus(self, tasks):
+    def update_type_submenus(self, type_counts: dict[str, int]):
         for filter_name, section in self.sidebar_sections.items():
             container = section["container"]
             layout = section["layout"]
@@ -887,7 +1342,7 @@ class MainWindow(QMainWindow):
                 self._clear_layout(layout)
                 container.setVisible(False)
                 continue
-            available_types = self._available_types(tasks)
+            available_types = self._available_types(type_counts)
             self._clear_layout(layout)
             for label, value in available_types:
                 button = QPushButton(label)
@@ -898,43 +1353,63 @@ class MainWindow(QMainWindow):
                 layout.addWidget(button)
             container.setVisible(bool(available_types))
 
-    def apply_type_filter(self, tasks):
-        if self.current_type is None:
-            return tasks
-        return [task for task in tasks if normalize_task_type(task.xtype) == self.current_type]
-
-    def _available_types(self, tasks):
-        counts = {value: 0 for _, value in self._type_entries()}
-        for task in tasks:
-            normalized = normalize_task_type(task.xtype)
-            if normalized in counts:
-                counts[normalized] += 1
+    def _available_types(self, type_counts: dict[str, int]):
         available = []
         for label, value in self._type_entries():
-            if counts.get(value, 0) > 0:
+            if type_counts.get(value, 0) > 0:
                 available.append((label, value))
         return available
 
     def open_settings(self):
         if self.settings_window is None or isdeleted(self.settings_window):
-            self.settings_window = SettingsWindow(self.settings_service)
-            self.settings_window.types_updated.connect(self.on_types_updated)
-            self.settings_window.statuses_updated.connect(self.on_statuses_updated)
+            # Imported here: the settings UI is rarely opened and not needed to start.
+            from app.ui.settings_window import SettingsWindow
+
+            self.settings_window = SettingsWindow(self.settings_service, self.service, self.worker)
+            self.settings_window.tasks_changed.connect(self.refresh_tasks)
+            self.settings_window.read_backend_changed.connect(self.on_read_backend_changed)
+            self.settings_window.task_backend_changed.connect(self.on_task_backend_changed)
         self.settings_window.show()
         self.settings_window.raise_()
         self.settings_window.activateWindow()
 
+    def on_setting_changed(self, key: str, value):
+        if key == TASK_TYPES_KEY:
+            self.on_types_updated(value)
+        elif key == STATUSES_KEY:
+            self.on_statuses_updated(value)
+
     def on_types_updated(self, types: list[str]):
         self.type_options = types
         self._populate_type_combo(self.detail_type)
         if self.current_type not in self._type_values():
             self.current_type = None
-        self.refresh_tasks()
+        self.show_view()
 
     def on_statuses_updated(self, statuses: list[str]):
         self.status_options = statuses
         self._populate_status_combo(self.detail_status)
 
+    def on_read_backend_changed(self, read_backend: str):
+        self.worker.submit(
+            self.service.set_read_backend,
+            read_backend,
+            on_success=lambda _result: self.refresh_tasks(),
+            on_error=self.show_error,
+        )
+
+    def on_task_backend_changed(self, name: str, shell_command: str):
+        self.worker.submit(
+            self.service.set_backend,
+            create_backend(name, shell_command),
+            on_success=self.on_task_backend_set,
+            on_error=self.show_error,
+        )
+
+    def on_task_backend_set(self, _result=None):
+        self.watch_data_location()
+        self.refresh_tasks()
+
     def reload_type_options(self):
         self.type_options = self.settings_service.get_task_types()
 
@@ -947,7 +1422,6 @@ class MainWindow(QMainWindow):
         combo.clear()
         for label, value in self._type_entries():
             combo.addItem(label, value)
-        combo.blockSignals(False)
         index = combo.findData(current_value)
         if index >= 0:
             combo.setCurrentIndex(index)
@@ -955,6 +1429,7 @@ class MainWindow(QMainWindow):
             empty_index = combo.findData("")
             if empty_index >= 0:
                 combo.setCurrentIndex(empty_index)
+        combo.blockSignals(False)
 
     def _populate_status_combo(self, combo: QComboBox):
         current_value = combo.currentText() if combo.count() else ""
@@ -966,7 +1441,6 @@ class MainWindow(QMainWindow):
             if not cleaned or cleaned == NONE_STATUS_LABEL:
                 continue
             combo.addItem(cleaned, cleaned)
-        combo.blockSignals(False)
         index = combo.findText(current_value)
         if index >= 0:
             combo.setCurrentIndex(index)
@@ -974,6 +1448,7 @@ class MainWindow(QMainWindow):
             empty_index = combo.findData("")
             if empty_index >= 0:
                 combo.setCurrentIndex(empty_index)
+        combo.blockSignals(False)
 
     def _type_entries(self):
         entries = [(NONE_TYPE_LABEL, "")]
@@ -996,61 +1471,3 @@ class MainWindow(QMainWindow):
             widget = item.widget()
             if widget is not None:
                 widget.deleteLater()
-
-    @staticmethod
-    def _format_completed_value(end_value: str) -> str:
-        parsed = parse_task_datetime(end_value)
-        if not parsed:
-            return ""
-        if parsed.tzinfo is not None:
-            parsed = parsed.astimezone()
-        return parsed.strftime("%Y-%m-%d %H:%M")
-
-def parse_due_date(value: str) -> QDate | None:
-    if not value:
-        return None
-    patterns = (
-        "%Y%m%dT%H%M%SZ",
-        "%Y%m%dT%H%M%S",
-        "%Y-%m-%d",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%dT%H:%M:%S",
-    )
-    for pattern in patterns:
-        try:
-            parsed = datetime.strptime(value, pattern)
-            return QDate(parsed.year, parsed.month, parsed.day)
-        except ValueError:
-            continue
-    if len(value) >= 8 and value[:8].isdigit():
-        try:
-            parsed = datetime.strptime(value[:8], "%Y%m%d")
-            return QDate(parsed.year, parsed.month, parsed.day)
-        except ValueError:
-            return None
-    return None
-
-
-def parse_task_datetime(value: str) -> datetime | None:
-    if not value:
-        return None
-    patterns = (
-        "%Y%m%dT%H%M%SZ",
-        "%Y%m%dT%H%M%S",
-        "%Y-%m-%dT%H:%M:%S%z",
-        "%Y-%m-%dT%H:%M:%S",
-    )
-    for pattern in patterns:
-        try:
-            parsed = datetime.strptime(value, pattern)
-            if pattern.endswith("Z"):
-                return parsed.replace(tzinfo=timezone.utc)
-            return parsed
-        except ValueError:
-            continue
-    if len(value) >= 8 and value[:8].isdigit():
-        try:
-            return datetime.strptime(value[:8], "%Y%m%d")
-        except ValueError:
-            return None
-    return None
@@ -0,0 +1,47 @@
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtWidgets import QFrame, QPlainTextEdit
+
+MAX_VISIBLE_LINES = 6
+
+
+class QuickAddInput(QPlainTextEdit):
+    """Task entry box: Enter submits, Shift+Enter starts a new line.
+
+    Pasted multi-line text is kept as is, one task per line, and the box grows
+    up to ``MAX_VISIBLE_LINES`` before scrolling.
+    """
+
+    submitted = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("QuickAddInput")
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setTabChangesFocus(True)
+        self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.document().contentsChanged.connect(self._fit_height)
+        self._fit_height()
+
+    def text(self) -> str:
+        return self.toPlainText()
+
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter) and not (
+            event.modifiers() & Qt.KeyboardModifier.ShiftModifier
+        ):
+            self.submitted.emit()
+            return
+        super().keyPressEvent(event)
+
+    def _fit_height(self):
+        lines = min(max(self.document().blockCount(), 1), MAX_VISIBLE_LINES)
+        margins = self.contentsMargins()
+        height = (
+            lines * self.fontMetrics().lineSpacing()
+            + int(self.document().documentMargin() * 2)
+            + margins.top()
+            + margins.bottom()
+            + 16
+        )
+        self.setFixedHeight(height)
@@ -1,23 +1,35 @@
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtWidgets import (
+    QComboBox,
     QHBoxLayout,
+    QInputDialog,
     QLabel,
     QLineEdit,
     QListWidget,
     QListWidgetItem,
     QMainWindow,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
     QTabWidget,
     QVBoxLayout,
     QWidget,
 )
 
-from app.services.settings_service import SettingsService
+from app.services.settings_service import (
+    READ_BACKEND_KEY,
+    SHELL_COMMAND_KEY,
+    TASK_BACKEND_KEY,
+    SettingsService,
+)
+from app.services.task_backend import DEFAULT_SHELL_COMMAND, TASK_BACKENDS
+from app.services.task_reader import READ_BACKENDS
+from app.services.task_service import TaskService
+from app.services.task_worker import TaskWorker
 
 
 class TaskTypeSettingsWidget(QWidget):
-    types_updated = pyqtSignal(list)
+    rename_requested = pyqtSignal(str, str)
 
     def __init__(self, service: SettingsService):
         super().__init__()
@@ -41,6 +53,9 @@ class TaskTypeSettingsWidget(QWidget):
 
         remove_row = QHBoxLayout()
         remove_row.addStretch(1)
+        self.rename_button = QPushButton("重命名/合并")
+        self.rename_button.clicked.connect(self.rename_selected)
+        remove_row.addWidget(self.rename_button)
         self.remove_button = QPushButton("移除选中")
         self.remove_button.clicked.connect(self.remove_selected)
         remove_row.addWidget(self.remove_button)
@@ -83,6 +98,34 @@ class TaskTypeSettingsWidget(QWidget):
             return
         self.type_list.takeItem(row)
 
+    def rename_selected(self) -> None:
+        item = self.type_list.currentItem()
+        if item is None:
+            return
+        old = item.text()
+        name, ok = QInputDialog.getText(
+            self, "重命名类型", f"将“{old}”重命名为（填写已有类型即合并）：", text=old
+        )
+        name = name.strip()
+        if not ok or not name or name == old:
+            return
+        if name == "无":
+            QMessageBox.information(self, "提示", "“无”为系统内置项，不能作为自定义类型。")
+            return
+        self.rename_requested.emit(old, name)
+
+    def apply_rename(self, old: str, new: str) -> None:
+        merged = self._has_type(new)
+        for row in reversed(range(self.type_list.count())):
+            item = self.type_list.item(row)
+            if item.text() != old:
+                continue
+            if merged:
+                self.type_list.takeItem(row)
+            else:
+                item.setText(new)
+                item.setData(Qt.ItemDataRole.UserRole, new)
+
     def save_types(self) -> None:
         types = []
         for index in range(self.type_list.count()):
@@ -90,8 +133,7 @@ class TaskTypeSettingsWidget(QWidget):
             name = (item.text() or "").strip()
             if name:
                 types.append(name)
-        saved = self.service.set_task_types(types)
-        self.types_updated.emit(saved)
+        self.service.set_task_types(types)
         QMessageBox.information(self, "设置", "已保存。")
 
     def _has_type(self, name: str) -> bool:
@@ -102,7 +144,7 @@ class TaskTypeSettingsWidget(QWidget):
 
 
 class StatusSettingsWidget(QWidget):
-    statuses_updated = pyqtSignal(list)
+    rename_requested = pyqtSignal(str, str)
 
     def __init__(self, service: SettingsService):
         super().__init__()
@@ -126,6 +168,9 @@ class StatusSettingsWidget(QWidget):
 
         remove_row = QHBoxLayout()
         remove_row.addStretch(1)
+        self.rename_button = QPushButton("重命名/合并")
+        self.rename_button.clicked.connect(self.rename_selected)
+        remove_row.addWidget(self.rename_button)
         self.remove_button = QPushButton("移除选中")
         self.remove_button.clicked.connect(self.remove_selected)
         remove_row.addWidget(self.remove_button)
@@ -168,6 +213,34 @@ class StatusSettingsWidget(QWidget):
             return
         self.status_list.takeItem(row)
 
+    def rename_selected(self) -> None:
+        item = self.status_list.currentItem()
+        if item is None:
+            return
+        old = item.text()
+        name, ok = QInputDialog.getText(
+            self, "重命名状态", f"将“{old}”重命名为（填写已有状态即合并）：", text=old
+        )
+        name = name.strip()
+        if not ok or not name or name == old:
+            return
+        if name == "无状态":
+            QMessageBox.information(self, "提示", "“无状态”为系统内置项，不能作为自定义状态。")
+            return
+        self.rename_requested.emit(old, name)
+
+    def apply_rename(self, old: str, new: str) -> None:
+        merged = self._has_status(new)
+        for row in reversed(range(self.status_list.count())):
+            item = self.status_list.item(row)
+            if item.text() != old:
+                continue
+            if merged:
+                self.status_list.takeItem(row)
+            else:
+                item.setText(new)
+                item.setData(Qt.ItemDataRole.UserRole, new)
+
     def save_statuses(self) -> None:
         statuses = []
         for index in range(self.status_list.count()):
@@ -175,8 +248,7 @@ class StatusSettingsWidget(QWidget):
             name = (item.text() or "").strip()
             if name:
                 statuses.append(name)
-        saved = self.service.set_statuses(statuses)
-        self.statuses_updated.emit(saved)
+        self.service.set_statuses(statuses)
         QMessageBox.information(self, "设置", "已保存。")
 
     def _has_status(self, name: str) -> bool:
@@ -186,13 +258,116 @@ class StatusSettingsWidget(QWidget):
         return False
 
 
-class SettingsWindow(QMainWindow):
-    types_updated = pyqtSignal(list)
-    statuses_updated = pyqtSignal(list)
+class DataSourceSettingsWidget(QWidget):
+    read_backend_changed = pyqtSignal(str)
+    task_backend_changed = pyqtSignal(str, str)
 
     def __init__(self, service: SettingsService):
         super().__init__()
         self.service = service
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+        layout.setSpacing(12)
+
+        layout.addWidget(QLabel("执行 Taskwarrior 命令的方式"))
+        self.task_backend_combo = QComboBox()
+        for name, label in TASK_BACKENDS.items():
+            self.task_backend_combo.addItem(label, name)
+        self.task_backend_combo.currentIndexChanged.connect(self.update_shell_input)
+        layout.addWidget(self.task_backend_combo)
+
+        self.shell_input = QLineEdit()
+        self.shell_input.setPlaceholderText(DEFAULT_SHELL_COMMAND)
+        layout.addWidget(self.shell_input)
+
+        layout.addWidget(QLabel("读取任务的方式"))
+        self.backend_combo = QComboBox()
+        for name, label in READ_BACKENDS.items():
+            self.backend_combo.addItem(label, name)
+        layout.addWidget(self.backend_combo)
+
+        hint = QLabel(
+            "直接读取会跳过 task 命令，从 taskchampion.sqlite3 或 pending.data/completed.data "
+            "中读取任务，数据量大时更快。新增、修改等写操作仍通过 task 命令执行。"
+        )
+        hint.setWordWrap(True)
+        hint.setStyleSheet("color: #6b7280;")
+        layout.addWidget(hint)
+
+        self.shell_hint = QLabel(
+            "持久 Shell 会话中 Taskwarrior 的数据文件在会话所在的环境（如容器）里，本机无法访问："
+            "只能通过 task 命令读取，终端中的修改不会自动同步，也无法从这里安装钩子。请使用菜单栏的「刷新」。"
+        )
+        self.shell_hint.setWordWrap(True)
+        self.shell_hint.setStyleSheet("color: #b45309;")
+        layout.addWidget(self.shell_hint)
+        layout.addStretch(1)
+
+        button_row = QHBoxLayout()
+        button_row.addStretch(1)
+        self.save_button = QPushButton("保存")
+        self.save_button.clicked.connect(self.save_backend)
+        button_row.addWidget(self.save_button)
+        layout.addLayout(button_row)
+
+        self.load_backend()
+
+    def load_backend(self) -> None:
+        self.read_backend = self.service.get_preference(READ_BACKEND_KEY, "cli")
+        self.task_backend = self.service.get_preference(TASK_BACKEND_KEY, "local")
+        self.shell_command = self.service.get_preference(SHELL_COMMAND_KEY, DEFAULT_SHELL_COMMAND)
+        self.backend_combo.setCurrentIndex(max(self.backend_combo.findData(self.read_backend), 0))
+        self.task_backend_combo.setCurrentIndex(max(self.task_backend_combo.findData(self.task_backend), 0))
+        self.shell_input.setText(self.shell_command)
+        self.update_shell_input()
+
+    def update_shell_input(self) -> None:
+        shell = self.task_backend_combo.currentData() == "shell"
+        self.shell_input.setEnabled(shell)
+        # A shell session's data files are not on this machine.
+        self.backend_combo.setEnabled(not shell)
+        if shell:
+            self.backend_combo.setCurrentIndex(max(self.backend_combo.findData("cli"), 0))
+        self.shell_hint.setVisible(shell)
+
+    def save_backend(self) -> None:
+        read_backend = self.backend_combo.currentData()
+        task_backend = self.task_backend_combo.currentData()
+        shell_command = self.shell_input.text().strip() or DEFAULT_SHELL_COMMAND
+        self.service.set_preferences(
+            {
+                READ_BACKEND_KEY: read_backend,
+                TASK_BACKEND_KEY: task_backend,
+                SHELL_COMMAND_KEY: shell_command,
+            }
+        )
+        if (task_backend, shell_command) != (self.task_backend, self.shell_command):
+            self.task_backend_changed.emit(task_backend, shell_command)
+        if read_backend != self.read_backend:
+            self.read_backend_changed.emit(read_backend)
+        self.read_backend = read_backend
+        self.task_backend = task_backend
+        self.shell_command = shell_command
+        QMessageBox.information(self, "设置", "已保存。")
+
+
+class SettingsWindow(QMainWindow):
+    read_backend_changed = pyqtSignal(str)
+    task_backend_changed = pyqtSignal(str, str)
+    # Tasks were rewritten in Taskwarrior by a rename or merge.
+    tasks_changed = pyqtSignal()
+
+    def __init__(
+        self,
+        service: SettingsService,
+        task_service: TaskService | None = None,
+        worker: TaskWorker | None = None,
+    ):
+        super().__init__()
+        self.service = service
+        self.task_service = task_service
+        self.worker = worker
         self.setObjectName("SettingsWindow")
         self.setWindowTitle("设置")
         self.resize(460, 380)
@@ -211,16 +386,91 @@ class SettingsWindow(QMainWindow):
         layout.addWidget(self.tabs, stretch=1)
 
         self.type_settings = TaskTypeSettingsWidget(self.service)
-        self.type_settings.types_updated.connect(self.types_updated.emit)
+        self.type_settings.rename_requested.connect(
+            lambda old, new: self.rename_value("xtype", old, new)
+        )
         self.tabs.addTab(self.type_settings, "任务类型配置")
 
         self.status_settings = StatusSettingsWidget(self.service)
-        self.status_settings.statuses_updated.connect(self.statuses_updated.emit)
+        self.status_settings.rename_requested.connect(
+            lambda old, new: self.rename_value("xstatus", old, new)
+        )
         self.tabs.addTab(self.status_settings, "状态配置")
 
+        self.data_source_settings = DataSourceSettingsWidget(self.service)
+        self.data_source_settings.read_backend_changed.connect(self.read_backend_changed.emit)
+        self.data_source_settings.task_backend_changed.connect(self.task_backend_changed.emit)
+        self.tabs.addTab(self.data_source_settings, "数据源")
+
         button_row = QHBoxLayout()
         button_row.addStretch(1)
         self.close_button = QPushButton("关闭")
         self.close_button.clicked.connect(self.close)
         button_row.addWidget(self.close_button)
         layout.addLayout(button_row)
+
+    def rename_value(self, field: str, old: str, new: str) -> None:
+        """Rename (or merge) a type or status, rewriting every task that uses it."""
+        if self.task_service is None or self.worker is None:
+            self._finish_rename(field, old, new)
+            return
+        self.worker.submit(
+            self.task_service.count_with_value,
+            field,
+            old,
+            on_success=lambda count: self._confirm_rename(field, old, new, count),
+            on_error=self.show_error,
+        )
+
+    def _confirm_rename(self, field: str, old: str, new: str, count: int) -> None:
+        if count == 0:
+            self._finish_rename(field, old, new)
+            return
+        label = "类型" if field == "xtype" else "状态"
+        existing = self.service.get_task_types() if field == "xtype" else self.service.get_statuses()
+        action = "合并到" if new in existing else "重命名为"
+        confirm = QMessageBox.question(
+            self,
+            f"重命名{label}",
+            f"有 {count} 个任务的{label}为“{old}”，将全部{action}“{new}”。确定继续吗？",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+        # One modify covers every task, so there is no per-task progress to report.
+        progress = QProgressDialog(f"正在更新 {count} 个任务的{label}…", None, 0, 0, self)
+        progress.setWindowTitle(f"重命名{label}")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.show()
+
+        def on_success(_count: int):
+            progress.close()
+            self._finish_rename(field, old, new)
+            self.tasks_changed.emit()
+
+        def on_error(message: str):
+            progress.close()
+            # Taskwarrior may have changed some tasks before failing.
+            self.tasks_changed.emit()
+            self.show_error(message)
+
+        self.worker.submit(
+            self.task_service.rename_value,
+            field,
+            old,
+            new,
+            on_success=on_success,
+            on_error=on_error,
+        )
+
+    def _finish_rename(self, field: str, old: str, new: str) -> None:
+        if field == "xtype":
+            self.service.rename_task_type(old, new)
+            self.type_settings.apply_rename(old, new)
+        else:
+            self.service.rename_status(old, new)
+            self.status_settings.apply_rename(old, new)
+
+    def show_error(self, message: str) -> None:
+        QMessageBox.critical(self, "错误", message)
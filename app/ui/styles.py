@@ -33,7 +33,7 @@ QLabel {
 QLabel#HeaderTitle {
     color: #2b5c9f;
 }
-QLineEdit, QComboBox, QDateEdit {
+QLineEdit, QComboBox, QDateEdit, QPlainTextEdit#QuickAddInput {
     background: #ffffff;
     border: 1px solid #d6e2f3;
     border-radius: 10px;
@@ -101,14 +101,16 @@ QPushButton#DetailCloseButton {
 QPushButton#DetailCloseButton:hover {
     color: #111827;
 }
-QPushButton#ExportButton {
+QPushButton#ExportButton,
+QPushButton#ImportButton {
     background: #e5efff;
     color: #1f5fd1;
     border: 1px solid #c7dcfb;
     border-radius: 10px;
     padding: 6px 10px;
 }
-QPushButton#ExportButton:hover {
+QPushButton#ExportButton:hover,
+QPushButton#ImportButton:hover {
     background: #dbeafe;
 }
 QListWidget {
@@ -135,6 +137,21 @@ QListWidget::item:selected:active {
 QListWidget::item:selected:!active {
     background: #DBEAFE;
 }
+QListView#TaskList {
+    background: #ffffff;
+    border: 1px solid #dbe6f6;
+    border-radius: 12px;
+    padding: 6px;
+}
+QListView#TaskList::item {
+    border: 1px solid #edf2fa;
+    border-radius: 10px;
+    padding: 0px;
+}
+QListView#TaskList::item:selected {
+    background: #DBEAFE;
+    border: 1px solid #bfdbfe;
+}
 QMenuBar {
     background: #eaf2fb;
 }
@@ -0,0 +1,374 @@
+import time
+from datetime import date
+
+from PyQt6.QtCore import QAbstractListModel, QDate, QEvent, QModelIndex, QRect, QSize, Qt, QUrl, pyqtSignal
+from PyQt6.QtGui import QColor, QDesktopServices, QFont, QFontMetrics
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+from app.models import DEFAULT_STATUS_LABEL, PRIORITY_LABELS, TaskItem, normalize_task_type
+
+TASK_ROLE = Qt.ItemDataRole.UserRole + 1
+
+ROW_MARGIN_H = 12
+ROW_MARGIN_V = 8
+CHECK_SPACING = 10
+LINE_SPACING = 2
+MAX_ROW_MOVES = 32
+
+WEEKDAY_LABELS = {
+    1: "周一",
+    2: "周二",
+    3: "周三",
+    4: "周四",
+    5: "周五",
+    6: "周六",
+    7: "周日",
+}
+
+
+class TaskListModel(QAbstractListModel):
+    check_toggled = pyqtSignal(str, bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks: list[TaskItem] = []
+        self._rows_by_uuid: dict[str, int] | None = None
+        self._pending_checks: dict[str, bool] = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._tasks)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._tasks):
+            return None
+        task = self._tasks[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_title(task)
+        if role == Qt.ItemDataRole.UserRole:
+            return task.uuid
+        if role == TASK_ROLE:
+            return task
+        if role == Qt.ItemDataRole.CheckStateRole:
+            checked = self._pending_checks.get(task.uuid, task.task_state == "completed")
+            return Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.CheckStateRole or not index.isValid():
+            return False
+        task = self._tasks[index.row()]
+        checked = value in (Qt.CheckState.Checked, Qt.CheckState.Checked.value)
+        # Show the new state right away; the next set_tasks() brings the real one.
+        self._pending_checks[task.uuid] = checked
+        self.dataChanged.emit(index, index, [role])
+        self.check_toggled.emit(task.uuid, checked)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return (
+            Qt.ItemFlag.ItemIsEnabled
+            | Qt.ItemFlag.ItemIsSelectable
+            | Qt.ItemFlag.ItemIsUserCheckable
+        )
+
+    def set_tasks(self, tasks) -> None:
+        """Reconcile the rows with ``tasks`` by uuid.
+
+        Only rows that were removed, inserted, moved or changed are reported to
+        the view, so selection and scroll position survive a refresh.
+        """
+        new_tasks = [task for task in tasks if task.uuid]
+        new_uuids = {task.uuid for task in new_tasks}
+        stale_checks = self._pending_checks
+        self._pending_checks = {}
+        self._rows_by_uuid = None
+
+        self._remove_missing(new_uuids)
+        present = {task.uuid for task in self._tasks}
+        survivors = [task.uuid for task in new_tasks if task.uuid in present]
+        if survivors != [task.uuid for task in self._tasks]:
+            self._reorder(survivors)
+
+        row = 0
+        while row < len(new_tasks):
+            task = new_tasks[row]
+            if task.uuid in present:
+                current = self._tasks[row]
+                if current is not task and current != task:
+                    self._tasks[row] = task
+                    index = self.index(row)
+                    self.dataChanged.emit(index, index)
+                row += 1
+                continue
+            end = row
+            while end < len(new_tasks) and new_tasks[end].uuid not in present:
+                end += 1
+            self.beginInsertRows(QModelIndex(), row, end - 1)
+            self._tasks[row:row] = new_tasks[row:end]
+            self.endInsertRows()
+            row = end
+
+        self._rows_by_uuid = None
+        for task_uuid in stale_checks:
+            row = self.row_for_uuid(task_uuid)
+            if row >= 0:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+
+    def _remove_missing(self, keep: set[str]) -> None:
+        row = len(self._tasks) - 1
+        while row >= 0:
+            if self._tasks[row].uuid in keep:
+                row -= 1
+                continue
+            end = row
+            while row >= 0 and self._tasks[row].uuid not in keep:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, end)
+            del self._tasks[row + 1:end + 1]
+            self.endRemoveRows()
+
+    def _reorder(self, order: list[str]) -> None:
+        current = [task.uuid for task in self._tasks]
+        displaced = sum(1 for old, new in zip(current, order) if old != new)
+        if displaced <= MAX_ROW_MOVES:
+            for target, task_uuid in enumerate(order):
+                if self._tasks[target].uuid == task_uuid:
+                    continue
+                source = target + 1
+                while self._tasks[source].uuid != task_uuid:
+                    source += 1
+                self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), target)
+                self._tasks.insert(target, self._tasks.pop(source))
+                self.endMoveRows()
+            return
+
+        # Wholesale reorder (e.g. a new sort mode): one layout change instead of
+        # hundreds of single-row moves, remapping persistent indexes by uuid.
+        self.layoutAboutToBeChanged.emit()
+        by_uuid = {task.uuid: task for task in self._tasks}
+        self._tasks = [by_uuid[task_uuid] for task_uuid in order]
+        new_rows = {task_uuid: row for row, task_uuid in enumerate(order)}
+        old_indexes = self.persistentIndexList()
+        new_indexes = [self.index(new_rows[current[index.row()]]) for index in old_indexes]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
+    def update_task(self, task: TaskItem) -> bool:
+        """Swap in a new version of a task that is already listed, keeping its row."""
+        row = self.row_for_uuid(task.uuid)
+        if row < 0:
+            return False
+        self._tasks[row] = task
+        self._pending_checks.pop(task.uuid, None)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+        return True
+
+    def tasks(self) -> list[TaskItem]:
+        return list(self._tasks)
+
+    def task_at(self, row: int) -> TaskItem | None:
+        if 0 <= row < len(self._tasks):
+            return self._tasks[row]
+        return None
+
+    def row_for_uuid(self, task_uuid: str) -> int:
+        if self._rows_by_uuid is None:
+            self._rows_by_uuid = {task.uuid: row for row, task in enumerate(self._tasks)}
+        return self._rows_by_uuid.get(task_uuid, -1)
+
+
+class TaskItemDelegate(QStyledItemDelegate):
+    """Paints a task row: checkbox, bold title and a meta line with the link."""
+
+    def sizeHint(self, option, index):
+        title_metrics = QFontMetrics(self._title_font(option.font, False))
+        meta_metrics = QFontMetrics(option.font)
+        height = ROW_MARGIN_V * 2 + title_metrics.height() + LINE_SPACING + meta_metrics.height()
+        return QSize(0, height)
+
+    def paint(self, painter, option, index):
+        task = index.data(TASK_ROLE)
+        if task is None:
+            super().paint(painter, option, index)
+            return
+        widget = option.widget
+        style = widget.style() if widget is not None else None
+        if style is None:
+            super().paint(painter, option, index)
+            return
+
+        panel = QStyleOptionViewItem(option)
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, panel, painter, widget)
+
+        completed = task.task_state == "completed"
+        checked = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+        check = QStyleOptionViewItem(option)
+        check.rect = self._check_rect(option)
+        check.state = check.state & ~QStyle.StateFlag.State_HasFocus
+        check.state |= QStyle.StateFlag.State_On if checked else QStyle.StateFlag.State_Off
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_IndicatorItemViewItemCheck, check, painter, widget)
+
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        if selected:
+            title_color = meta_color = QColor("#000000")
+        elif completed:
+            title_color = meta_color = QColor("#9aa3b2")
+        else:
+            title_color = QColor("#1a1d24")
+            meta_color = QColor("#4b5563")
+
+        title_rect, meta_rect = self._text_rects(option)
+        painter.save()
+        title_font = self._title_font(option.font, completed)
+        painter.setFont(title_font)
+        painter.setPen(title_color)
+        title = QFontMetrics(title_font).elidedText(
+            format_title(task), Qt.TextElideMode.ElideRight, title_rect.width()
+        )
+        painter.drawText(title_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, title)
+
+        meta_font = QFont(option.font)
+        meta_font.setStrikeOut(completed)
+        metrics = QFontMetrics(meta_font)
+        painter.setFont(meta_font)
+        prefix, link_text = format_meta(task)
+        prefix = metrics.elidedText(prefix, Qt.TextElideMode.ElideRight, meta_rect.width())
+        painter.setPen(meta_color)
+        painter.drawText(meta_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, prefix)
+        link_rect = self._link_rect(meta_rect, metrics, prefix, link_text)
+        if link_rect.width() > 0:
+            painter.setPen(meta_color if completed else QColor("#2563eb"))
+            link_text = metrics.elidedText(link_text, Qt.TextElideMode.ElideRight, link_rect.width())
+            painter.drawText(link_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, link_text)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        task = index.data(TASK_ROLE)
+        if task is None:
+            return False
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            pos = event.position().toPoint()
+            if self._check_rect(option).adjusted(-4, -4, 4, 4).contains(pos):
+                self._toggle(model, index)
+                return True
+            if task.link:
+                _, meta_rect = self._text_rects(option)
+                metrics = QFontMetrics(option.font)
+                prefix, link_text = format_meta(task)
+                prefix = metrics.elidedText(prefix, Qt.TextElideMode.ElideRight, meta_rect.width())
+                if self._link_rect(meta_rect, metrics, prefix, link_text).contains(pos):
+                    QDesktopServices.openUrl(QUrl(task.link))
+                    return True
+            return False
+        if event.type() == QEvent.Type.KeyPress and event.key() in (Qt.Key.Key_Space, Qt.Key.Key_Select):
+            self._toggle(model, index)
+            return True
+        return False
+
+    @staticmethod
+    def _toggle(model, index) -> None:
+        checked = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+        new_state = Qt.CheckState.Unchecked if checked else Qt.CheckState.Checked
+        model.setData(index, new_state, Qt.ItemDataRole.CheckStateRole)
+
+    @staticmethod
+    def _title_font(base: QFont, completed: bool) -> QFont:
+        font = QFont(base)
+        font.setWeight(QFont.Weight.DemiBold)
+        font.setStrikeOut(completed)
+        return font
+
+    @staticmethod
+    def _check_rect(option) -> QRect:
+        size = 16
+        widget = option.widget
+        if widget is not None:
+            size = widget.style().pixelMetric(QStyle.PixelMetric.PM_IndicatorWidth, option, widget)
+        rect = option.rect
+        return QRect(rect.left() + ROW_MARGIN_H, rect.center().y() - size // 2 + 1, size, size)
+
+    def _text_rects(self, option) -> tuple[QRect, QRect]:
+        check_rect = self._check_rect(option)
+        left = check_rect.right() + 1 + CHECK_SPACING
+        rect = option.rect
+        width = max(0, rect.right() - ROW_MARGIN_H - left)
+        title_height = QFontMetrics(self._title_font(option.font, False)).height()
+        meta_height = QFontMetrics(option.font).height()
+        top = rect.top() + max(0, (rect.height() - title_height - LINE_SPACING - meta_height) // 2)
+        title_rect = QRect(left, top, width, title_height)
+        meta_rect = QRect(left, top + title_height + LINE_SPACING, width, meta_height)
+        return title_rect, meta_rect
+
+    @staticmethod
+    def _link_rect(meta_rect: QRect, metrics: QFontMetrics, prefix: str, link_text: str) -> QRect:
+        if not link_text:
+            return QRect()
+        offset = metrics.horizontalAdvance(prefix)
+        available = meta_rect.width() - offset
+        if available <= 0:
+            return QRect()
+        width = min(available, metrics.horizontalAdvance(link_text) + 1)
+        return QRect(meta_rect.left() + offset, meta_rect.top(), width, meta_rect.height())
+
+
+def format_title(task: TaskItem) -> str:
+    xtype = normalize_task_type(task.xtype)
+    if xtype:
+        return f"{xtype}·{task.description}"
+    return task.description or ""
+
+
+def format_meta(task: TaskItem) -> tuple[str, str]:
+    """Return the meta line split into plain text and the clickable link part."""
+    effective_priority = task.priority or "L"
+    priority_label = PRIORITY_LABELS.get(effective_priority, effective_priority)
+    priority_text = f"【{priority_label}】" if priority_label else ""
+    status_text = task.xstatus or (DEFAULT_STATUS_LABEL if task.task_state != "completed" else "已完成")
+    completion_text = ""
+    if task.task_state == "completed":
+        completion_text = format_completed(task)
+    due_text = format_due(task)
+    prefix = f"{priority_text}{status_text}{completion_text}{due_text} · "
+    if task.link:
+        return prefix, task.link
+    return f"{prefix}无链接", ""
+
+
+def format_due(task: TaskItem) -> str:
+    if task.due_day is None:
+        return ""
+    due_date = date.fromordinal(task.due_day)
+    if _is_same_week(due_date, date.today()):
+        weekday = WEEKDAY_LABELS.get(due_date.isoweekday(), "")
+        return f" · 截止 {due_date.isoformat()} {weekday}"
+    return f" · 截止 {due_date.isoformat()}"
+
+
+def format_completed(task: TaskItem) -> str:
+    value = format_completed_time(task)
+    if not value:
+        return ""
+    return f" · 完成 {value}"
+
+
+def format_completed_time(task: TaskItem) -> str:
+    if task.end_ts is None:
+        return ""
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(task.end_ts))
+
+
+def to_qdate(day: int | None) -> QDate | None:
+    if day is None:
+        return None
+    value = date.fromordinal(day)
+    return QDate(value.year, value.month, value.day)
+
+
+def _is_same_week(value: date, today: date) -> bool:
+    return value.isocalendar()[:2] == today.isocalendar()[:2]
@@ -0,0 +1,200 @@
+import shutil
+import time
+
+import pytest
+
+from app.models import TaskFilter, format_timestamp
+from app.services.task_backend import FakeTaskBackend, ShellSessionBackend, TaskwarriorError
+from app.services.task_cache import TaskCache
+from app.services.task_service import TaskService
+
+TASK_A = "11111111-1111-1111-1111-111111111111"
+TASK_B = "22222222-2222-2222-2222-222222222222"
+TASK_C = "33333333-3333-3333-3333-333333333333"
+TASK_D = "44444444-4444-4444-4444-444444444444"
+MISSING = "99999999-9999-9999-9999-999999999999"
+
+# Stands in for the task binary: echoes its arguments, then its stdin.
+FAKE_TASK = """#!/bin/sh
+if [ "$1" = fail ]; then
+    echo "No matches." >&2
+    exit 2
+fi
+if [ "$1" = nonl ]; then
+    printf 'no newline'
+    exit 0
+fi
+printf 'args:'
+for arg in "$@"; do printf ' [%s]' "$arg"; done
+echo
+cat
+"""
+
+
+def days_ago(days):
+    return format_timestamp(int(time.time()) - days * 86400)
+
+
+@pytest.fixture
+def shell_backend(tmp_path):
+    if shutil.which("sh") is None:
+        pytest.skip("no POSIX shell")
+    script = tmp_path / "task"
+    script.write_text(FAKE_TASK, encoding="utf-8")
+    script.chmod(0o755)
+    backend = ShellSessionBackend("sh", task_binary=str(script))
+    yield backend
+    backend.close()
+
+
+def make_service(tmp_path, tasks):
+    backend = FakeTaskBackend(tasks)
+    return TaskService(TaskCache(str(tmp_path / "cache.db")), backend=backend), backend
+
+
+def test_shell_session_quotes_arguments(shell_backend):
+    output = shell_backend.run(["export", "a b", "it's", "$HOME"])
+
+    assert output == "args: [export] [a b] [it's] [$HOME]\n"
+
+
+def test_shell_session_passes_input_untouched(shell_backend):
+    payload = '[{"description": "$(rm -rf /) `x` \\\\ 中文"}]'
+
+    output = shell_backend.run(["import"], input=payload)
+
+    assert output == f"args: [import]\n{payload}\n"
+
+
+def test_shell_session_frames_output_without_newline(shell_backend):
+    assert shell_backend.run(["nonl"]) == "no newline"
+    assert shell_backend.run(["next"]) == "args: [next]\n"
+
+
+def test_shell_session_raises_with_stderr(shell_backend):
+    with pytest.raises(TaskwarriorError) as excinfo:
+        shell_backend.run(["fail"])
+
+    assert excinfo.value.details == "No matches."
+    assert "找不到要操作的任务" in str(excinfo.value)
+    # The session survives a failed command.
+    assert shell_backend.run(["ok"]) == "args: [ok]\n"
+
+
+def test_shell_session_reuses_one_process(shell_backend):
+    shell_backend.run(["one"])
+    process = shell_backend._process
+    shell_backend.run(["two"])
+
+    assert shell_backend._process is process
+    shell_backend.close()
+    assert shell_backend._process is None
+    assert process.poll() is not None
+
+
+def test_delta_sync_exports_only_changes(tmp_path):
+    service, backend = make_service(tmp_path, [
+        {"uuid": TASK_A, "description": "first"},
+        {"uuid": TASK_B, "description": "second"},
+    ])
+    assert {task.uuid for task in service.fetch_tasks("all")} == {TASK_A, TASK_B}
+
+    service.modify_many([TASK_A], {"description": "changed"})
+    tasks = {task.uuid: task for task in service.fetch_tasks("all")}
+
+    assert backend.commands[-1][0].startswith("modified.after:")
+    assert tasks[TASK_A].description == "changed"
+    assert tasks[TASK_B].description == "second"
+
+
+def test_full_sync_drops_vanished_tasks(tmp_path):
+    service, backend = make_service(tmp_path, [
+        {"uuid": TASK_A, "description": "first"},
+        {"uuid": TASK_B, "description": "second"},
+    ])
+    service.fetch_tasks("all")
+    # Gone without a newer modified stamp, as after ``task undo``.
+    del backend.tasks[TASK_B]
+
+    assert {task.uuid for task in service.fetch_tasks("all")} == {TASK_A, TASK_B}
+    assert {task.uuid for task in service.fetch_tasks("all", full_sync=True)} == {TASK_A}
+
+
+def test_completed_history_loads_in_windows(tmp_path):
+    service, _ = make_service(tmp_path, [
+        {"uuid": TASK_A, "description": "open"},
+        {"uuid": TASK_B, "description": "recent", "status": "completed", "end": days_ago(5)},
+        {"uuid": TASK_C, "description": "older", "status": "completed", "end": days_ago(45)},
+        {"uuid": TASK_D, "description": "oldest", "status": "completed", "end": days_ago(200)},
+    ])
+
+    assert {task.uuid for task in service.fetch_tasks("completed")} == {TASK_B}
+    assert set(service.load_older_completed()) == {TASK_C}
+    # The empty windows in between are skipped over.
+    assert set(service.load_older_completed()) == {TASK_D}
+    assert service.has_older_completed()
+    assert service.load_older_completed() == {}
+    assert not service.has_older_completed()
+    assert {task.uuid for task in service.fetch_tasks("completed")} == {TASK_B, TASK_C, TASK_D}
+
+
+def test_import_records_merges_over_existing(tmp_path):
+    service, backend = make_service(tmp_path, [
+        {"uuid": TASK_A, "description": "old", "tags": ["work"], "xtype": "bug", "project": "home"},
+    ])
+
+    count = service.import_records(
+        [
+            {"uuid": TASK_A, "description": "new", "xtype": "", "status": "completed"},
+            {"uuid": TASK_B, "description": "added", "status": "pending"},
+        ],
+        update_uuids=[TASK_A, TASK_B],
+    )
+
+    assert count == 2
+    updated = backend.tasks[TASK_A]
+    assert updated["description"] == "new"
+    assert updated["tags"] == ["work"]
+    assert updated["project"] == "home"
+    assert "xtype" not in updated
+    assert updated["status"] == "completed" and updated["end"]
+    assert backend.tasks[TASK_B]["description"] == "added"
+
+
+def test_flush_writes_merges_and_isolates_failures(tmp_path):
+    service, backend = make_service(tmp_path, [
+        {"uuid": TASK_A, "description": "a"},
+        {"uuid": TASK_B, "description": "b"},
+        {"uuid": TASK_C, "description": "c"},
+    ])
+    service.queue_write("modify", [TASK_A], {"xstatus": "进行中"})
+    service.queue_write("modify", [TASK_B], {"xstatus": "进行中"})
+    service.queue_write("complete", [TASK_C])
+    service.queue_write("reopen", [TASK_C])
+    service.queue_write("delete", [MISSING])
+    backend.commands.clear()
+
+    results = service.flush_writes()
+
+    assert [result.ok for result in results] == [True, True, True, True, False]
+    assert "找不到要操作的任务" in results[-1].error
+    assert not service.has_queued_writes()
+    assert backend.tasks[TASK_A]["xstatus"] == backend.tasks[TASK_B]["xstatus"] == "进行中"
+    assert backend.tasks[TASK_C]["status"] == "pending"
+    # The two modifies share a command and complete/reopen cancel out.
+    assert [command for command in backend.commands if "modify" in command] == [
+        [TASK_A, TASK_B, "modify", "xstatus:进行中"]
+    ]
+    assert not any("done" in command for command in backend.commands)
+
+
+def test_export_applies_filter_and_search(tmp_path):
+    service, _ = make_service(tmp_path, [
+        {"uuid": TASK_A, "description": "写周报", "xtype": "需求"},
+        {"uuid": TASK_B, "description": "修复 bug", "xtype": "缺陷"},
+        {"uuid": TASK_C, "description": "周会", "status": "completed", "end": days_ago(400)},
+    ])
+    path = tmp_path / "out.jsonl"
+
+    assert service.export_to_file(TaskFilter(state="pending", search="type:需求"), str(path)) == 1
+    assert service.export_to_file(TaskFilter(search="周"), str(path)) == 2
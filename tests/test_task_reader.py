@@ -0,0 +1,148 @@
+import json
+import sqlite3
+
+import pytest
+
+from app.services.task_reader import (
+    _to_export_record,
+    parse_f4_line,
+    read_data_files,
+    read_task_data,
+    read_taskchampion,
+)
+
+TASK_A = "11111111-1111-1111-1111-111111111111"
+TASK_B = "22222222-2222-2222-2222-222222222222"
+TASK_C = "33333333-3333-3333-3333-333333333333"
+
+
+def write_taskchampion(path, tasks, working_set):
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("create table tasks (uuid string primary key, data string)")
+        conn.execute("create table working_set (id integer primary key, uuid string)")
+        conn.executemany(
+            "insert into tasks (uuid, data) values (?, ?)",
+            [(task_uuid, json.dumps(data, ensure_ascii=False)) for task_uuid, data in tasks.items()],
+        )
+        conn.executemany("insert into working_set (id, uuid) values (?, ?)", working_set)
+    conn.close()
+
+
+@pytest.fixture
+def taskchampion_dir(tmp_path):
+    write_taskchampion(
+        tmp_path / "taskchampion.sqlite3",
+        {
+            TASK_A: {
+                "status": "pending",
+                "description": "写周报",
+                "entry": "1760000000",
+                "due": "1760086400",
+                "tag_work": "",
+                "tag_home": "",
+                "annotation_1760000100": "第一条备注",
+                "xtype": "需求",
+            },
+            TASK_B: {"status": "pending", "description": "second", "entry": "1760000001"},
+            TASK_C: {"status": "completed", "description": "done", "entry": "1750000000", "end": "1750003600"},
+        },
+        # Id 1 was freed when its task completed; ids are not dense.
+        [(1, None), (2, TASK_B), (3, TASK_A)],
+    )
+    return tmp_path
+
+
+def test_taskchampion_export_shape(taskchampion_dir):
+    tasks = read_taskchampion(str(taskchampion_dir / "taskchampion.sqlite3"))
+
+    assert [task["uuid"] for task in tasks] == [TASK_B, TASK_A, TASK_C]
+    first = tasks[1]
+    assert first["id"] == 3
+    assert first["description"] == "写周报"
+    assert first["xtype"] == "需求"
+    assert first["entry"] == "20251009T085320Z"
+    assert first["due"] == "20251010T085320Z"
+    assert sorted(first["tags"]) == ["home", "work"]
+    assert first["annotations"] == [{"entry": "20251009T085500Z", "description": "第一条备注"}]
+    assert not any(name.startswith(("tag_", "annotation_")) for name in first)
+    assert tasks[2]["id"] == 0
+    assert tasks[2]["end"] == "20250615T160640Z"
+
+
+def test_read_task_data_prefers_taskchampion(taskchampion_dir):
+    (taskchampion_dir / "pending.data").write_text('[description:"stale" uuid:"x"]\n', encoding="utf-8")
+
+    assert {task["uuid"] for task in read_task_data(str(taskchampion_dir))} == {TASK_A, TASK_B, TASK_C}
+
+
+def test_data_files_number_pending_tasks(tmp_path):
+    (tmp_path / "pending.data").write_text(
+        f'[description:"first" entry:"1760000000" status:"pending" uuid:"{TASK_A}"]\n'
+        "\n"
+        f'[description:"second" status:"pending" tags:"work,home" uuid:"{TASK_B}"]\n',
+        encoding="utf-8",
+    )
+    (tmp_path / "completed.data").write_text(
+        f'[description:"done" end:"1750003600" status:"completed" uuid:"{TASK_C}"]\n',
+        encoding="utf-8",
+    )
+
+    tasks = read_task_data(str(tmp_path))
+
+    assert [(task["uuid"], task["id"]) for task in tasks] == [(TASK_A, 1), (TASK_B, 2), (TASK_C, 0)]
+    assert tasks[0]["entry"] == "20251009T085320Z"
+    assert tasks[1]["tags"] == ["work", "home"]
+    assert tasks[2]["end"] == "20250615T160640Z"
+
+
+def test_data_files_without_completed(tmp_path):
+    (tmp_path / "pending.data").write_text(f'[description:"only" uuid:"{TASK_A}"]\n', encoding="utf-8")
+
+    assert [task["description"] for task in read_data_files(str(tmp_path))] == ["only"]
+
+
+def test_missing_data_raises(tmp_path):
+    with pytest.raises(RuntimeError):
+        read_task_data(str(tmp_path))
+
+
+def test_f4_entities_and_escapes():
+    line = (
+        r'[description:"&open;draft&close; say &dquot;hi&dquot;" '
+        r'xdesc:"line one\nline two \"quoted\" C:\\temp" link:"http://x/?a=1&b=2"]'
+    )
+
+    attributes = parse_f4_line(line)
+
+    assert attributes["description"] == '[draft] say "hi"'
+    assert attributes["xdesc"] == 'line one\nline two "quoted" C:\\temp'
+    assert attributes["link"] == "http://x/?a=1&b=2"
+
+
+def test_f4_annotations_and_tag_attributes():
+    line = (
+        f'[annotation_1760000100:"看 &open;文档&close;" description:"x" '
+        f'tag_urgent:"x" tags:"work" uuid:"{TASK_A}"]'
+    )
+
+    (task,) = _records_from_lines(line)
+
+    assert task["annotations"] == [{"entry": "20251009T085500Z", "description": "看 [文档]"}]
+    assert sorted(task["tags"]) == ["urgent", "work"]
+
+
+def test_f4_tags_written_both_ways_are_listed_once():
+    # Taskwarrior 2.6 keeps the tags list and a tag_<name> attribute per tag.
+    (task,) = _records_from_lines(f'[description:"x" tag_home:"x" tag_work:"x" tags:"home,work" uuid:"{TASK_A}"]')
+
+    assert sorted(task["tags"]) == ["home", "work"]
+
+
+def test_f4_ignores_malformed_lines():
+    assert parse_f4_line("not a task") == {}
+    assert parse_f4_line("[description:\"unterminated]") == {}
+
+
+def _records_from_lines(*lines):
+    return [_to_export_record(parse_f4_line(line)) for line in lines]